@@ -0,0 +1,53 @@
+"""
+Micro-Benchmark für die Aufbereitung der Etikettendaten: iterrows() + format_val je Zeile
+im Vergleich zu label_records (spaltenweise).
+
+Aufruf (im Projektordner):
+    python -m benchmarks.bench_label_records
+"""
+import time
+
+from stocklist.lagerliste import format_val, generate_lagerliste
+from stocklist.pdf import label_records
+
+
+# (Regale, Fächer, Ebenen)
+SIZES = [
+    (2, 10, 5),
+    (10, 50, 10),
+    (26, 100, 20),
+]
+
+
+def legacy_label_records(df):
+    """
+    Bisherige Umsetzung: eine pandas-Series pro Zeile und format_val für Regal/Fach/Ebene.
+    """
+    records = []
+    for _, row in df.iterrows():
+        regal = format_val(row["Regal"])
+        fach = format_val(row["Fach"])
+        ebene = format_val(row["Ebene"])
+        records.append((str(row["Daten für QR-Code"]), str(row["Lagerort"]), f"{regal}-{fach}-{ebene}"))
+    return records
+
+
+def timed(func, *args):
+    t0 = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - t0, result
+
+
+def main():
+    print(f"{'Etiketten':>10} {'iterrows µs/Etikett':>20} {'spaltenweise µs/Etikett':>24} {'Faktor':>7}")
+    for regale, faecher, ebenen in SIZES:
+        df = generate_lagerliste("Halle1", "Zahlen", regale, faecher, ebenen, [])
+        n = len(df)
+        t_old, old = timed(legacy_label_records, df)
+        t_new, new = timed(label_records, df)
+        assert old == new
+        print(f"{n:>10} {t_old / n * 1e6:>20.2f} {t_new / n * 1e6:>24.2f} {t_old / t_new:>7.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Benchmark für generate_lagerliste: vektorisiertes Raster vs. verschachtelte Schleifen,
+sowie viele Sonderlagerorte bei wenigen/keinen Lagerplätzen (kleine Außenlager).
+
+Aufruf (im Projektordner):
+    python -m benchmarks.bench_lagerliste
+    python -m benchmarks.bench_lagerliste --max-slots 2000000
+"""
+import argparse
+import string
+import time
+import tracemalloc
+
+import pandas as pd
+
+from stocklist.lagerliste import generate_lagerliste
+
+
+# (Regale, Fächer, Ebenen)
+SIZES = [
+    (1, 10, 4),
+    (5, 20, 5),
+    (26, 100, 20),
+    (26, 400, 20),
+    (26, 1000, 100),
+]
+
+
+# (Regale, Fächer, Ebenen, Anzahl Sonderlagerorte) - Außenlager mit wenigen oder keinen Plätzen
+SONDER_SIZES = [
+    (0, 0, 0, 100),
+    (0, 0, 0, 1000),
+    (1, 2, 2, 1000),
+    (0, 0, 0, 5000),
+]
+
+
+def legacy_generate_lagerliste(lagerort, regal_typ, regale, faecher, ebenen):
+    """
+    Bisherige Umsetzung (Schleifen + str.split) als Vergleich, ohne Sonderlagerorte.
+    """
+    if regal_typ == "Buchstaben":
+        regal_labels = list(string.ascii_uppercase)[:regale]
+    else:
+        regal_labels = [str(i + 1) for i in range(regale)]
+    rows = []
+    for regal in regal_labels[::-1]:
+        for fach in range(faecher, 0, -1):
+            for ebene in range(ebenen, 0, -1):
+                rows.append([lagerort, regal, fach, ebene, "", f"{lagerort};{regal}-{fach}-{ebene}"])
+    df = pd.DataFrame(rows, columns=["Lagerort", "Regal", "Fach", "Ebene", "Sonderlagerorte", "Daten für QR-Code"])
+    split_vals = df["Daten für QR-Code"].astype(str).str.split(";", n=1, expand=True)
+    df["LO"] = split_vals[0]
+    df["LP"] = split_vals[1]
+    return df
+
+
+def legacy_append_sonderorte(sonderorte):
+    """
+    Bisheriges Anhängen überzähliger Sonderlagerorte (ein pd.concat pro Zeile) bei leerem Raster.
+    """
+    columns = ["Lagerort", "Regal", "Fach", "Ebene", "Sonderlagerorte", "Daten für QR-Code"]
+    df = pd.DataFrame([], columns=columns)
+    for ort in sonderorte:
+        df = pd.concat([df, pd.DataFrame([["", "", "", "", ort, ""]], columns=columns)], ignore_index=True)
+    return df
+
+
+def measure(func, *args):
+    """
+    Laufzeit (ohne tracemalloc, das stark bremst) und Speicherspitze in getrennten Läufen.
+    """
+    t0 = time.perf_counter()
+    func(*args)
+    elapsed = time.perf_counter() - t0
+
+    tracemalloc.start()
+    func(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--max-slots", type=int, default=600_000, help="Größte Rastergröße für den Schleifen-Vergleich")
+    args = parser.parse_args(argv)
+
+    print(f"{'Plätze':>10} {'vektor s':>10} {'vektor MB':>10} {'schleife s':>11} {'schleife MB':>12}")
+    for regale, faecher, ebenen in SIZES:
+        slots = regale * faecher * ebenen
+        t_new, m_new = measure(generate_lagerliste, "Halle1", "Buchstaben", regale, faecher, ebenen, ["Waschplatz"])
+        if slots <= args.max_slots:
+            t_old, m_old = measure(legacy_generate_lagerliste, "Halle1", "Buchstaben", regale, faecher, ebenen)
+            old = f"{t_old:>11.3f} {m_old / 1e6:>12.1f}"
+        else:
+            old = f"{'-':>11} {'-':>12}"
+        print(f"{slots:>10} {t_new:>10.3f} {m_new / 1e6:>10.1f} {old}")
+
+    print()
+    print(f"{'Plätze':>10} {'Sonder':>7} {'neu s':>10} {'concat s':>10}")
+    for regale, faecher, ebenen, anzahl in SONDER_SIZES:
+        sonderorte = [f"Sonderort {i}" for i in range(anzahl)]
+        t_new, _ = measure(generate_lagerliste, "Außenlager", "Zahlen", regale, faecher, ebenen, sonderorte)
+        if regale == 0:
+            t_old, _ = measure(legacy_append_sonderorte, sonderorte)
+            old = f"{t_old:>10.3f}"
+        else:
+            old = f"{'-':>10}"
+        print(f"{regale * faecher * ebenen:>10} {anzahl:>7} {t_new:>10.4f} {old}")
+
+
+if __name__ == "__main__":
+    main()
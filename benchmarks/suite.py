@@ -0,0 +1,335 @@
+"""
+Benchmark-Suite für alle Stufen: Lagerliste erzeugen, Excel schreiben/lesen, alle PDF-Renderer, Vorschau.
+
+Jede Stufe läuft je Lagergröße in einem eigenen Prozess, gemessen werden Laufzeit,
+Speicherspitze (Peak-RSS) und Größe der erzeugten Datei. Die Ergebnisse können als
+Baseline gespeichert und spätere Läufe damit verglichen werden. tkinter wird nicht geladen.
+
+Aufruf (im Projektordner):
+    python -m benchmarks.suite                         # Standardgrößen, Vergleich mit baseline.json
+    python -m benchmarks.suite --preset full           # bis 26 Regale x 100 Fächer x 20 Ebenen
+    python -m benchmarks.suite --stages pdf_a4_png,pdf_a4_vector --sizes 26x100x20
+    python -m benchmarks.suite --save-baseline         # aktuelle Werte als Baseline ablegen
+    python -m benchmarks.suite --check                 # Exit-Code 1 bei Verschlechterung
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+# (Regale, Fächer, Ebenen)
+PRESETS = {
+    "quick": [(1, 10, 4), (5, 20, 5)],
+    "full": [(1, 10, 4), (5, 20, 5), (10, 50, 10), (26, 100, 20)],
+}
+
+SONDERORTE = 50        # Sonderlagerorte in jeder Test-Lagerliste
+PREVIEW_TEXTS = 200    # Vorschaubilder je Lauf (wie beim Tippen)
+
+# Zeit-Toleranz für --check (Laufzeiten schwanken je nach Rechner/Last)
+TIME_TOLERANCE = 0.25
+SIZE_TOLERANCE = 0.02
+
+
+# --------------------------------
+# Stufen (laufen jeweils im Kindprozess)
+# --------------------------------
+
+def _sonderorte():
+    return [f"Sonderort {i}" for i in range(SONDERORTE)]
+
+
+def stage_generate(size, workdir):
+    from stocklist.lagerliste import generate_lagerliste
+
+    generate_lagerliste("Halle1", "Buchstaben", *size, _sonderorte())
+    return None
+
+
+def stage_excel_stream(size, workdir):
+    from stocklist.lagerliste import write_lagerliste_excel
+
+    path = os.path.join(workdir, "stream.xlsx")
+    write_lagerliste_excel(path, "Halle1", "Buchstaben", *size, _sonderorte())
+    return path
+
+
+def stage_excel_dataframe(size, workdir):
+    from stocklist.lagerliste import generate_lagerliste, write_excel
+
+    path = os.path.join(workdir, "dataframe.xlsx")
+    write_excel(generate_lagerliste("Halle1", "Buchstaben", *size, _sonderorte()), path)
+    return path
+
+
+def _read_labels_stage(suffix):
+    def stage(size, workdir):
+        from stocklist.pdf import read_label_records
+
+        list(read_label_records(_input_path(workdir, suffix)))
+        return None
+
+    return stage
+
+
+def _pdf_stage(func_name, backend):
+    def stage(size, workdir):
+        from stocklist import pdf
+
+        path = os.path.join(workdir, f"{func_name}_{backend}.pdf")
+        getattr(pdf, func_name)(_input_path(workdir), path, "70x32 mm", qr_backend=backend)
+        return path
+
+    return stage
+
+
+def stage_pipeline_a4(size, workdir):
+    from stocklist.pipeline import create_from_layout
+
+    path = os.path.join(workdir, "pipeline_a4.pdf")
+    create_from_layout("Halle1", "Buchstaben", *size, _sonderorte(), a4_pdf=path, fmt_value="70x32 mm")
+    return path
+
+
+def stage_pdf_special(size, workdir):
+    from stocklist.pdf import create_special_locations_pdf
+
+    path = os.path.join(workdir, "special.pdf")
+    create_special_locations_pdf(_input_path(workdir), path)
+    return path
+
+
+def stage_single_qr(size, workdir):
+    from stocklist.pdf import create_single_qr
+
+    path = os.path.join(workdir, "single_qr.pdf")
+    create_single_qr("Halle1;A-1-1", path, "70x32 mm")
+    return path
+
+
+def stage_preview(size, workdir):
+    from stocklist.preview import render_preview
+
+    for i in range(PREVIEW_TEXTS):
+        render_preview(f"Halle1;A-{i}-1", "70x32 mm", 0.6)
+    return None
+
+
+STAGES = {
+    "generate": stage_generate,
+    "excel_stream": stage_excel_stream,
+    "excel_dataframe": stage_excel_dataframe,
+    "read_labels": _read_labels_stage(".xlsx"),
+    "read_labels_csv": _read_labels_stage(".csv"),
+    "read_labels_parquet": _read_labels_stage(".parquet"),
+    "read_labels_feather": _read_labels_stage(".feather"),
+    "pdf_a4_png": _pdf_stage("create_qr_labels_a4", "png"),
+    "pdf_a4_vector": _pdf_stage("create_qr_labels_a4", "vector"),
+    "pdf_single_png": _pdf_stage("create_qr_labels_from_excel", "png"),
+    "pdf_single_vector": _pdf_stage("create_qr_labels_from_excel", "vector"),
+    "pipeline_a4": stage_pipeline_a4,
+    "pdf_special": stage_pdf_special,
+    "single_qr": stage_single_qr,
+    "preview": stage_preview,
+}
+
+# Stufen, die nicht von der Lagergröße abhängen, laufen nur einmal (kleinste Größe)
+SIZE_INDEPENDENT = {"single_qr", "preview"}
+
+# Stufen mit optionalen Abhängigkeiten (fehlt das Modul, wird die Stufe übersprungen)
+REQUIRES = {"read_labels_parquet": "pyarrow", "read_labels_feather": "pyarrow"}
+
+
+def _input_path(workdir, suffix=".xlsx"):
+    return os.path.join(workdir, "input" + suffix)
+
+
+def _available(stage):
+    module = REQUIRES.get(stage)
+    if module is None:
+        return True
+    try:
+        __import__(module)
+    except ImportError:
+        return False
+    return True
+
+
+def _peak_rss_kb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS liefert Bytes, Linux Kilobytes
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def run_child(stage, size, workdir):
+    """
+    Führt eine Stufe im aktuellen Prozess aus und gibt das Messergebnis als JSON aus.
+    Die Importe zählen nicht zur Laufzeit.
+    """
+    import openpyxl  # noqa: F401  (wird von stocklist.reader erst beim Lesen einer .xlsx geladen)
+    import stocklist.lagerliste  # noqa: F401
+    import stocklist.pdf  # noqa: F401
+    import stocklist.preview  # noqa: F401
+
+    t0 = time.perf_counter()
+    output = STAGES[stage](size, workdir)
+    wall = time.perf_counter() - t0
+    print(json.dumps({
+        "wall_s": round(wall, 4),
+        "peak_rss_kb": _peak_rss_kb(),
+        "output_bytes": os.path.getsize(output) if output else None,
+    }))
+
+
+# --------------------------------
+# Steuerung
+# --------------------------------
+
+def size_key(size):
+    return "x".join(str(n) for n in size)
+
+
+def parse_size(text):
+    parts = tuple(int(p) for p in text.lower().split("x"))
+    if len(parts) != 3:
+        raise argparse.ArgumentTypeError(f"Größe als RegalexFächerxEbenen, z.B. 26x100x20: {text!r}")
+    return parts
+
+
+def prepare_input(size, workdir, stages):
+    from stocklist.lagerliste import write_lagerliste_excel
+    from stocklist.listfile import convert_lagerliste
+
+    write_lagerliste_excel(_input_path(workdir), "Halle1", "Buchstaben", *size, _sonderorte())
+    # Dieselbe Liste in den anderen Formaten für die read_labels_*-Stufen
+    for suffix in (".csv", ".parquet", ".feather"):
+        if f"read_labels_{suffix[1:]}" in stages:
+            convert_lagerliste(_input_path(workdir), _input_path(workdir, suffix))
+
+
+def measure(stage, size, workdir):
+    cmd = [sys.executable, "-m", "benchmarks.suite", "--child", stage, "--sizes", size_key(size), "--workdir", workdir]
+    out = subprocess.run(cmd, check=True, capture_output=True, text=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def load_baseline(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def compare(result, base):
+    """
+    Liefert eine Liste von Verschlechterungen (Text) gegenüber der Baseline.
+    """
+    problems = []
+    if base.get("wall_s") and result["wall_s"] > base["wall_s"] * (1 + TIME_TOLERANCE) + 0.05:
+        problems.append(f"Zeit {base['wall_s']:.3f}s -> {result['wall_s']:.3f}s")
+    if base.get("peak_rss_kb") and result["peak_rss_kb"] and result["peak_rss_kb"] > base["peak_rss_kb"] * 1.25:
+        problems.append(f"RSS {base['peak_rss_kb'] // 1024} MB -> {result['peak_rss_kb'] // 1024} MB")
+    if base.get("output_bytes") and result["output_bytes"] and (
+        result["output_bytes"] > base["output_bytes"] * (1 + SIZE_TOLERANCE)
+    ):
+        problems.append(f"Datei {base['output_bytes']} B -> {result['output_bytes']} B")
+    return problems
+
+
+def _fmt(value, unit=""):
+    return "-" if value is None else f"{value}{unit}"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--preset", choices=sorted(PRESETS), default="quick", help="Lagergrößen")
+    parser.add_argument("--sizes", help="Eigene Größen, z.B. 1x10x4,26x100x20 (statt --preset)")
+    parser.add_argument("--stages", help=f"Nur diese Stufen (Komma-getrennt): {', '.join(STAGES)}")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="Baseline-Datei (JSON)")
+    parser.add_argument("--save-baseline", action="store_true", help="Ergebnisse in die Baseline übernehmen")
+    parser.add_argument("--check", action="store_true", help="Exit-Code 1, wenn eine Stufe schlechter ist")
+    parser.add_argument("--output", help="Ergebnisse zusätzlich als JSON speichern")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    parser.add_argument("--workdir", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    sizes = [parse_size(s) for s in args.sizes.split(",")] if args.sizes else PRESETS[args.preset]
+
+    if args.child:
+        run_child(args.child, sizes[0], args.workdir)
+        return 0
+
+    stages = args.stages.split(",") if args.stages else list(STAGES)
+    unknown = [s for s in stages if s not in STAGES]
+    if unknown:
+        parser.error(f"Unbekannte Stufen: {', '.join(unknown)}")
+    for stage in [s for s in stages if not _available(s)]:
+        print(f"{stage}: übersprungen ({REQUIRES[stage]} nicht installiert)")
+        stages.remove(stage)
+
+    baseline = load_baseline(args.baseline)
+    results = {}
+    regressions = []
+
+    print(f"{'Stufe':<18} {'Größe':>10} {'Zeit s':>9} {'RSS MB':>7} {'Datei KB':>9}  Baseline")
+    for i, size in enumerate(sizes):
+        with tempfile.TemporaryDirectory(prefix="stocklist-bench-") as workdir:
+            prepare_input(size, workdir, stages)
+            for stage in stages:
+                if stage in SIZE_INDEPENDENT and i > 0:
+                    continue
+                key = f"{stage}/{size_key(size)}"
+                result = measure(stage, size, workdir)
+                results[key] = result
+
+                base = baseline.get(key)
+                if base is None:
+                    status = "neu"
+                else:
+                    problems = compare(result, base)
+                    regressions.extend(f"{key}: {p}" for p in problems)
+                    status = "; ".join(problems) if problems else f"ok ({base['wall_s']:.3f}s)"
+
+                rss = result["peak_rss_kb"] // 1024 if result["peak_rss_kb"] else None
+                out_kb = result["output_bytes"] // 1024 if result["output_bytes"] else None
+                print(
+                    f"{stage:<18} {size_key(size):>10} {result['wall_s']:>9.3f} "
+                    f"{_fmt(rss):>7} {_fmt(out_kb):>9}  {status}"
+                )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=1, sort_keys=True)
+
+    if args.save_baseline:
+        baseline.update(results)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=1, sort_keys=True)
+        print(f"Baseline gespeichert: {args.baseline}")
+
+    if regressions:
+        print()
+        print("Verschlechterungen:")
+        for line in regressions:
+            print(f"  {line}")
+        if args.check:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
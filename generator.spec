@@ -5,7 +5,7 @@ a = Analysis(
     ['generator.py'],
     pathex=[],
     binaries=[],
-    datas=[],
+    datas=[('stocklist/label_formats.json', 'stocklist')],
     hiddenimports=[],
     hookspath=[],
     hooksconfig={},
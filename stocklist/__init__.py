@@ -0,0 +1,15 @@
+"""
+Kernfunktionen des Lagerlisten- & QR-Code-Generators ohne GUI.
+
+Die Module importieren kein tkinter und können daher auch headless (z.B. aus
+nächtlichen Batch-Jobs) genutzt werden:
+
+- stocklist.lagerliste: Lagerliste erzeugen und als Excel speichern
+- stocklist.listfile:  Lagerliste als CSV, Parquet oder Feather speichern und umwandeln
+- stocklist.pdf:        Etiketten-PDFs (Einzeletiketten, A4, Sonderlagerorte)
+- stocklist.preview:    Vorschau-Rendering mit Pillow
+- stocklist.cli:        Kommandozeile (python -m stocklist ...)
+
+Die Untermodule werden bewusst nicht hier importiert, damit jeder Aufruf nur
+die Bibliotheken lädt, die er wirklich braucht.
+"""
@@ -0,0 +1,231 @@
+"""
+Batch-Läufe für mehrere Lagerorte (Standorte) aus einer Manifest-Datei.
+
+Das Manifest (JSON, TOML oder YAML) beschreibt alle Standorte mit ihrem
+Regalaufbau, Etikettenformat und den gewünschten Ausgaben:
+
+    {
+      "output_dir": "ausgabe",
+      "workers": 4,
+      "qr_cache_dir": "qr-cache",
+      "defaults": {"regal_typ": "Buchstaben", "format": "70x32", "outputs": ["excel", "labels-a4"]},
+      "sites": [
+        {"lagerort": "Halle1", "regale": 5, "faecher": 20, "ebenen": 5, "sonderorte": ["Waschplatz"]},
+        {"lagerort": "Reifenhotel", "regale": 10, "faecher": 30, "ebenen": 4, "radsaetze": 4},
+        {"lagerort": "Halle2", "regale": 3, "faecher": 10, "ebenen": 4, "outputs": ["labels-single"]}
+      ]
+    }
+
+Relative Pfade gelten relativ zum Manifest. Die PDFs entstehen direkt aus dem
+Regalaufbau (stocklist.pipeline), ohne die Excel-Liste wieder einzulesen. Alle
+Standorte laufen in einem Prozess (QR-, Schrift- und Layout-Caches werden
+geteilt) oder mit workers > 1 in einem Prozess-Pool; die Worker teilen sich
+dann die QR-Codes über den Festplatten-Cache. Ergebnisse und Zeiten je Standort (siehe
+stocklist.profiling) landen in einer Zusammenfassung (batch_summary.json).
+Ein fehlerhafter Standort bricht den Lauf nicht ab.
+"""
+import json
+import os
+import re
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from stocklist import formats, qrcache
+from stocklist.profiling import profile_run
+
+
+# Ausgabe -> Dateiendung (Namen wie die Unterbefehle von python -m stocklist)
+OUTPUTS = {
+    "excel": "_lagerliste.xlsx",
+    "labels-a4": "_etiketten_a4.pdf",
+    "labels-single": "_etiketten.pdf",
+    "special-pdf": "_sonderlagerorte.pdf",
+}
+DEFAULT_OUTPUTS = ["excel", "labels-a4"]
+SUMMARY_NAME = "batch_summary.json"
+
+
+# --------------------------------
+# Manifest einlesen
+# --------------------------------
+
+def _site_name(lagerort):
+    # Dateiname aus dem Lagerort (nur Buchstaben, Ziffern, - und _)
+    return re.sub(r"[^\w-]+", "_", lagerort).strip("_") or "lagerort"
+
+
+class Site:
+    """
+    Ein Standort aus dem Manifest (Standardwerte aus "defaults" bereits eingerechnet).
+    """
+
+    def __init__(self, spec, base_dir):
+        if not spec.get("lagerort"):
+            raise ValueError(f"Standort ohne lagerort: {spec}")
+        self.lagerort = str(spec["lagerort"])
+        self.name = str(spec.get("name") or _site_name(self.lagerort))
+        self.regal_typ = spec.get("regal_typ", "Buchstaben")
+        self.regale = int(spec.get("regale", 0))
+        self.faecher = int(spec.get("faecher", 0))
+        self.ebenen = int(spec.get("ebenen", 0))
+        self.radsaetze = int(spec.get("radsaetze", 1))
+        self.format = spec.get("format")
+        # Fehler, die erst beim Start auffallen (z.B. unbekanntes Format); der Standort wird dann übersprungen
+        self.error = None
+        self.qr_backend = spec.get("qr_backend", "png")
+
+        self.sonderorte = [str(s) for s in spec.get("sonderorte", [])]
+        if spec.get("sonderorte_datei"):
+            with open(os.path.join(base_dir, spec["sonderorte_datei"]), encoding="utf-8") as f:
+                self.sonderorte.extend(f.read().splitlines())
+
+        self.outputs = list(spec.get("outputs", DEFAULT_OUTPUTS))
+        unknown = [o for o in self.outputs if o not in OUTPUTS]
+        if unknown:
+            raise ValueError(f"{self.name}: unbekannte Ausgaben {unknown} (möglich: {', '.join(OUTPUTS)})")
+
+    def lagerliste_args(self):
+        return self.lagerort, self.regal_typ, self.regale, self.faecher, self.ebenen, self.sonderorte, self.radsaetze
+
+    def output_path(self, output_dir, output):
+        return os.path.join(output_dir, self.name + OUTPUTS[output])
+
+
+class BatchManifest:
+    """
+    Eingelesenes Manifest: Standorte, Ausgabeordner, Worker-Anzahl und Caches.
+    """
+
+    def __init__(self, data, base_dir="."):
+        def resolve(path):
+            return os.path.join(base_dir, path) if path else None
+
+        self.output_dir = resolve(data.get("output_dir", "."))
+        self.workers = int(data.get("workers") or 1)
+        self.qr_cache_dir = resolve(data.get("qr_cache_dir"))
+        self.formats_file = resolve(data.get("formats_file"))
+
+        defaults = data.get("defaults", {})
+        self.sites = [Site({**defaults, **spec}, base_dir) for spec in data.get("sites", [])]
+        if not self.sites:
+            raise ValueError("Das Manifest enthält keine Standorte (sites)")
+        names = [s.name for s in self.sites]
+        duplicates = sorted({n for n in names if names.count(n) > 1})
+        if duplicates:
+            raise ValueError(f"Standortnamen mehrfach vergeben: {', '.join(duplicates)}")
+
+    def check_formats(self):
+        """
+        Setzt die Formatdatei des Manifests (ohne formats_file bleibt die aktuelle, z.B. aus
+        STOCKLIST_LABEL_FORMATS) und ersetzt Kurznamen (z.B. "70x32") durch die vollen Namen.
+        Standorte mit unbekanntem Format bekommen einen Fehler, die übrigen laufen trotzdem.
+        """
+        registry = formats.configure(self.formats_file) if self.formats_file else formats.get_registry()
+        for site in self.sites:
+            layout = registry.find(site.format) if site.format else registry.get()
+            if layout is None:
+                site.error = f"unbekanntes Etikettenformat {site.format!r}"
+            else:
+                site.format = layout.name
+
+
+def load_manifest(path):
+    """
+    Liest ein Batch-Manifest (.json, .toml, .yaml/.yml).
+    """
+    return BatchManifest(formats.read_config_file(path), os.path.dirname(os.path.abspath(path)))
+
+
+# --------------------------------
+# Standorte abarbeiten
+# --------------------------------
+
+def run_site(site, output_dir):
+    """
+    Erzeugt alle Ausgaben eines Standorts direkt aus dem Regalaufbau (siehe stocklist.pipeline)
+    und liefert dessen Ergebnis für die Zusammenfassung. Fehler werden im Ergebnis vermerkt statt weitergereicht.
+    """
+    from stocklist.pipeline import create_from_layout
+
+    result = {"name": site.name, "lagerort": site.lagerort, "status": "ok", "outputs": {}}
+    paths = {output: site.output_path(output_dir, output) for output in site.outputs}
+    with profile_run(site.name) as profile:
+        try:
+            if site.error:
+                raise ValueError(site.error)
+            outputs = create_from_layout(
+                *site.lagerliste_args(),
+                excel_path=paths.get("excel"),
+                a4_pdf=paths.get("labels-a4"),
+                single_pdf=paths.get("labels-single"),
+                special_pdf=paths.get("special-pdf"),
+                fmt_value=site.format,
+                qr_backend=site.qr_backend,
+            )
+            # Schlüssel wie im Manifest (excel, labels-a4, labels-single, special-pdf)
+            for output in site.outputs:
+                key = {"labels-a4": "a4", "labels-single": "single", "special-pdf": "special"}.get(output, output)
+                result["outputs"][output] = outputs[key]
+        except Exception as e:
+            result["status"] = "fehler"
+            result["error"] = f"{type(e).__name__}: {e}"
+
+    summary = profile.summary()
+    result.update(wall_s=summary["wall_s"], stages=summary["stages"], counters=summary["counters"])
+    return result
+
+
+def run_batch(manifest, workers=None, summary_path=None, progress=None):
+    """
+    Arbeitet alle Standorte des Manifests ab (workers überschreibt den Wert aus dem Manifest).
+    Schreibt die Zusammenfassung nach summary_path (Standard: <output_dir>/batch_summary.json)
+    und gibt sie als dict zurück. progress(erledigt, gesamt) wird nach jedem Standort aufgerufen.
+    """
+    manifest.check_formats()
+    os.makedirs(manifest.output_dir, exist_ok=True)
+    workers = min(workers or manifest.workers, len(manifest.sites))
+    started = datetime.now().isoformat(timespec="seconds")
+    t0 = time.perf_counter()
+
+    if manifest.qr_cache_dir:
+        qrcache.configure(disk_dir=manifest.qr_cache_dir)
+
+    results = []
+    total = len(manifest.sites)
+    if workers <= 1:
+        for site in manifest.sites:
+            results.append(run_site(site, manifest.output_dir))
+            if progress:
+                progress(len(results), total)
+    else:
+        from stocklist.parallel import init_worker
+
+        # Ohne eigenen Cache-Ordner teilen sich die Worker einen temporären
+        with tempfile.TemporaryDirectory(prefix="stocklist-qr-") as tmp_cache:
+            disk_dir = manifest.qr_cache_dir or tmp_cache
+            initargs = (disk_dir, formats.formats_path())
+            with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=initargs) as pool:
+                futures = [pool.submit(run_site, site, manifest.output_dir) for site in manifest.sites]
+                try:
+                    for future in futures:
+                        results.append(future.result())
+                        if progress:
+                            progress(len(results), total)
+                except BaseException:
+                    pool.shutdown(cancel_futures=True)
+                    raise
+
+    summary = {
+        "started": started,
+        "wall_s": round(time.perf_counter() - t0, 4),
+        "workers": workers,
+        "sites": results,
+        "failed": [r["name"] for r in results if r["status"] != "ok"],
+    }
+    summary_path = summary_path or os.path.join(manifest.output_dir, SUMMARY_NAME)
+    with open(summary_path, "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2, ensure_ascii=False)
+    summary["summary_path"] = summary_path
+    return summary
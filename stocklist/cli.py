@@ -0,0 +1,388 @@
+"""
+Kommandozeile für Batch-Läufe ohne GUI.
+
+Beispiele:
+    python -m stocklist list --lagerort Halle1 --regale 5 --faecher 10 --ebenen 4 -o lagerliste.xlsx
+    python -m stocklist labels-a4 lagerliste.xlsx -o etiketten_a4.pdf --format 75x25
+    python -m stocklist labels-single lagerliste.xlsx -o etiketten.pdf
+    python -m stocklist special-pdf lagerliste.xlsx -o sonderlagerorte.pdf
+    python -m stocklist labels-a4 lagerliste.xlsx -o etiketten_a4.pdf --profile zeiten.json --profile-dump lauf.prof
+    python -m stocklist build --lagerort Halle1 --regale 5 --faecher 10 --ebenen 4 --a4 etiketten_a4.pdf --excel lagerliste.xlsx
+    python -m stocklist convert lagerliste.xlsx lagerliste.parquet
+    python -m stocklist batch standorte.yaml --workers 4
+
+Die Bibliotheken (pandas, reportlab, qrcode, ...) werden erst im jeweiligen
+Unterbefehl importiert, tkinter wird nie geladen.
+"""
+import argparse
+import sys
+
+
+def _read_sonderorte(args):
+    sonderorte = list(args.sonderort or [])
+    if args.sonderorte_datei:
+        with open(args.sonderorte_datei, encoding="utf-8") as f:
+            sonderorte.extend(f.read().splitlines())
+    return sonderorte
+
+
+def cmd_list(args):
+    from stocklist.listfile import write_lagerliste_file
+    from stocklist.reader import detect_format
+
+    try:
+        formatted = write_lagerliste_file(
+            args.output,
+            args.lagerort,
+            args.regal_typ,
+            args.regale,
+            args.faecher,
+            args.ebenen,
+            _read_sonderorte(args),
+            args.radsaetze,
+        )
+    except (ImportError, ValueError) as e:
+        raise SystemExit(str(e))
+    if detect_format(args.output) != "xlsx":
+        print(f"Lagerliste gespeichert: {args.output}")
+    elif formatted:
+        print(f"Excel-Datei gespeichert: {args.output}")
+    else:
+        print(f"Excel-Datei gespeichert (ohne Spaltenbreiten-Formatierung): {args.output}")
+    return 0
+
+
+def cmd_convert(args):
+    from stocklist.listfile import convert_lagerliste
+
+    try:
+        convert_lagerliste(args.source, args.target)
+    except (ImportError, ValueError) as e:
+        raise SystemExit(str(e))
+    print(f"Lagerliste gespeichert: {args.target}")
+    return 0
+
+
+def _setup_qr_cache(args):
+    from stocklist import qrcache
+
+    if args.qr_cache_dir:
+        qrcache.configure(disk_dir=args.qr_cache_dir)
+
+
+def _print_qr_cache_stats():
+    from stocklist.qrcache import cache_stats
+
+    # Bilder (PNG-Backend) und Matrizen (PNG und Vektor); nicht genutzte Caches werden nicht erwähnt
+    stats = cache_stats()
+    parts = []
+    if stats["image_hits"] or stats["image_misses"]:
+        parts.append(
+            f"Bilder {stats['image_hits']} Treffer, {stats['image_misses']} Fehlzugriffe "
+            f"({stats['disk_hits']} von Festplatte)"
+        )
+    if stats["matrix_hits"] or stats["matrix_misses"]:
+        parts.append(f"Matrizen {stats['matrix_hits']} Treffer, {stats['matrix_misses']} Fehlzugriffe")
+    if parts:
+        print("QR-Cache: " + "; ".join(parts))
+
+
+def _label_format(args):
+    """
+    Lädt ggf. die eigene Formatdatei und liefert den vollständigen Formatnamen (z.B. "70x32 mm").
+    """
+    from stocklist import formats
+
+    if args.formats_file:
+        formats.configure(args.formats_file)
+    registry = formats.get_registry()
+    layout = registry.find(args.format) if args.format else registry.get()
+    if layout is None:
+        names = ", ".join(registry.names())
+        raise SystemExit(f"Unbekanntes Etikettenformat {args.format!r} (verfügbar: {names})")
+    return layout.name
+
+
+def _print_outputs(message, result):
+    # Einzelne Datei oder Liste von Teildateien (--max-pages)
+    for path in result if isinstance(result, list) else [result]:
+        print(f"{message}: {path}")
+
+
+def _label_selection(args):
+    from stocklist.reader import LabelSelection
+
+    try:
+        return LabelSelection(args.regal, args.fach, args.ebene, args.radsatz)
+    except ValueError as e:
+        raise SystemExit(str(e))
+
+
+def _render_incremental(args, kind):
+    from stocklist.incremental import render_incremental
+    from stocklist.pdf import read_label_records
+
+    if args.max_pages:
+        raise SystemExit("--max-pages ist mit --incremental/--delta nicht kombinierbar")
+    records = read_label_records(args.excel, _label_selection(args))
+    stats = render_incremental(
+        kind, args.output, records, _label_format(args), args.qr_backend,
+        delta_pdf=args.delta, workers=args.workers,
+    )
+    print(f"{stats['rendered']} von {stats['pages']} Seiten neu gerendert, {stats['reused']} übernommen")
+    if args.delta:
+        print(f"Delta-PDF mit {stats['delta_labels']} neuen/geänderten Etiketten: {args.delta}")
+    return args.output
+
+
+def _run_labels(args, kind, func, message):
+    _setup_qr_cache(args)
+    try:
+        if args.incremental or args.delta:
+            result = _render_incremental(args, kind)
+        else:
+            result = func(
+                args.excel, args.output, _label_format(args),
+                qr_backend=args.qr_backend, workers=args.workers,
+                selection=_label_selection(args), max_pages=args.max_pages,
+            )
+    except (ImportError, ValueError) as e:
+        # z.B. falsche Datei ohne Spalte "Daten für QR-Code" oder Parquet ohne pyarrow
+        raise SystemExit(str(e))
+    _print_outputs(message, result)
+    _print_qr_cache_stats()
+    return 0
+
+
+def cmd_labels_a4(args):
+    from stocklist.pdf import create_qr_labels_a4
+
+    return _run_labels(args, "a4", create_qr_labels_a4, "A4 PDF erstellt")
+
+
+def cmd_labels_single(args):
+    from stocklist.pdf import create_qr_labels_from_excel
+
+    return _run_labels(args, "single", create_qr_labels_from_excel, "PDF erstellt")
+
+
+def cmd_special_pdf(args):
+    from stocklist.pdf import create_special_locations_pdf
+
+    _setup_qr_cache(args)
+    try:
+        create_special_locations_pdf(
+            args.excel, args.output, qr_backend=args.qr_backend, background_dpi=args.background_dpi
+        )
+    except (ImportError, ValueError) as e:
+        raise SystemExit(str(e))
+    print(f"Sonderlagerorte PDF erstellt: {args.output}")
+    _print_qr_cache_stats()
+    return 0
+
+
+def cmd_build(args):
+    from stocklist.pipeline import create_from_layout
+
+    if not (args.excel or args.a4 or args.single or args.special):
+        raise SystemExit("Mindestens eine Ausgabe angeben: --excel, --a4, --single oder --special")
+    if args.max_pages and args.incremental:
+        raise SystemExit("--max-pages ist mit --incremental nicht kombinierbar")
+    _setup_qr_cache(args)
+    outputs = create_from_layout(
+        args.lagerort, args.regal_typ, args.regale, args.faecher, args.ebenen,
+        _read_sonderorte(args), args.radsaetze,
+        excel_path=args.excel, a4_pdf=args.a4, single_pdf=args.single, special_pdf=args.special,
+        fmt_value=_label_format(args), qr_backend=args.qr_backend, workers=args.workers,
+        incremental=args.incremental, selection=_label_selection(args), max_pages=args.max_pages,
+    )
+    for key, message in (
+        ("excel", "Lagerliste gespeichert"),
+        ("a4", "A4 PDF erstellt"),
+        ("single", "PDF erstellt"),
+        ("special", "Sonderlagerorte PDF erstellt"),
+    ):
+        if key in outputs:
+            _print_outputs(message, outputs[key])
+    _print_qr_cache_stats()
+    return 0
+
+
+def cmd_batch(args):
+    from stocklist.batch import load_manifest, run_batch
+
+    try:
+        manifest = load_manifest(args.manifest)
+        summary = run_batch(manifest, workers=args.workers, summary_path=args.summary)
+    except (OSError, ValueError) as e:
+        raise SystemExit(str(e))
+
+    for site in summary["sites"]:
+        if site["status"] == "ok":
+            print(f"{site['name']}: {site['wall_s']:.2f} s, {len(site['outputs'])} Ausgaben")
+        else:
+            print(f"{site['name']}: FEHLER {site['error']}")
+    print(f"{len(summary['sites'])} Standorte in {summary['wall_s']:.2f} s, Zusammenfassung: {summary['summary_path']}")
+    return 1 if summary["failed"] else 0
+
+
+def _add_qr_backend_argument(p):
+    p.add_argument(
+        "--qr-backend",
+        choices=["png", "vector"],
+        default="png",
+        help="QR-Codes als Rasterbild (png) oder als Vektorgrafik (vector) einbetten",
+    )
+
+
+def _add_grid_arguments(p):
+    # Regalaufbau (list, build)
+    p.add_argument("--lagerort", required=True)
+    p.add_argument("--regal-typ", choices=["Buchstaben", "Zahlen"], default="Buchstaben")
+    p.add_argument("--regale", type=int, default=0, help="Anzahl Regale")
+    p.add_argument("--faecher", type=int, default=0, help="Anzahl Fächer")
+    p.add_argument("--ebenen", type=int, default=0, help="Anzahl Ebenen")
+    p.add_argument("--radsaetze", type=int, default=1, help="Radsätze pro Fach/Ebene (ab 2 mit Spalte Radsatz)")
+    p.add_argument("--sonderort", action="append", help="Sonderlagerort (mehrfach möglich)")
+    p.add_argument("--sonderorte-datei", help="Textdatei mit einem Sonderlagerort pro Zeile")
+
+
+def _add_label_arguments(p):
+    # Etiketten-Optionen (labels-a4, labels-single, build)
+    p.add_argument("--format", help="Etikettenformat, z.B. 70x32 oder 75x25 (Standard aus der Formatdatei)")
+    p.add_argument("--formats-file", help="Eigene Formatdatei (JSON/TOML) statt label_formats.json")
+    p.add_argument("--qr-cache-dir", help="Verzeichnis für den QR-Code-Cache auf der Festplatte")
+    _add_qr_backend_argument(p)
+    p.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help=(
+            "Anzahl Prozesse für paralleles Rendern. Alle Läufe mit --workers (ab 1) sind byte-identisch "
+            "zueinander; ohne --workers enthält die PDF wie bisher Zeitstempel und eine zufällige ID"
+        ),
+    )
+    p.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Nur geänderte Seiten neu rendern (Manifest neben der PDF, siehe stocklist.incremental)",
+    )
+    p.add_argument("--regal", help="Nur diese Regale, z.B. A-C oder 1-5,8")
+    p.add_argument("--fach", help="Nur diese Fächer, z.B. 1-10")
+    p.add_argument("--ebene", help="Nur diese Ebenen, z.B. 1,2")
+    p.add_argument("--radsatz", help="Nur diese Radsätze, z.B. 1-2")
+    p.add_argument(
+        "--max-pages",
+        type=int,
+        help="Auf mehrere Dateien mit höchstens so vielen Seiten aufteilen (_001.pdf, _002.pdf, ...)",
+    )
+
+
+def _add_profile_arguments(p):
+    p.add_argument("--profile", metavar="JSON", help="Zeitmessung je Stufe und Zähler als JSON speichern")
+    p.add_argument(
+        "--profile-dump",
+        metavar="DATEI",
+        help="Zusätzlich ein Profil schreiben (cProfile: .prof für pstats/snakeviz, pyinstrument: HTML)",
+    )
+    p.add_argument("--profiler", choices=["cprofile", "pyinstrument"], default="cprofile")
+
+
+def _run_profiled(args):
+    from stocklist.profiling import profile_run
+
+    if args.profile_dump and args.profiler == "pyinstrument":
+        try:
+            import pyinstrument  # noqa: F401
+        except ImportError:
+            raise SystemExit("pyinstrument ist nicht installiert (pip install pyinstrument)")
+    with profile_run(args.command, args.profile, args.profile_dump, args.profiler) as profile:
+        result = args.func(args)
+
+    stages = sorted(profile.stages.items(), key=lambda item: item[1][1], reverse=True)
+    print(f"Laufzeit {profile.wall:.2f} s, davon " + ", ".join(
+        f"{name} {own:.2f} s" for name, (_, own, _) in stages[:5]
+    ))
+    if args.profile:
+        print(f"Zeitmessung gespeichert: {args.profile}")
+    if args.profile_dump:
+        print(f"Profil gespeichert: {args.profile_dump}")
+    return result
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m stocklist",
+        description="Lagerlisten & QR-Code Generator (ohne GUI)",
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("list", help="Lagerliste als Excel (oder CSV/Parquet/Feather) erzeugen")
+    _add_grid_arguments(p)
+    p.add_argument("-o", "--output", required=True, help="Zieldatei (.xlsx, .csv, .parquet oder .feather)")
+    _add_profile_arguments(p)
+    p.set_defaults(func=cmd_list)
+
+    for name, func, help_text in (
+        ("labels-a4", cmd_labels_a4, "A4-PDF mit Etiketten im Raster"),
+        ("labels-single", cmd_labels_single, "PDF mit einem Etikett pro Seite"),
+    ):
+        p = sub.add_parser(name, help=help_text)
+        p.add_argument("excel", help="Vorher erstellte Lagerliste (.xlsx, .csv, .parquet oder .feather)")
+        p.add_argument("-o", "--output", required=True, help="Ziel-PDF")
+        _add_label_arguments(p)
+        p.add_argument("--delta", help="Zusätzlich PDF nur mit neuen/geänderten Etiketten schreiben")
+        _add_profile_arguments(p)
+        p.set_defaults(func=func)
+
+    p = sub.add_parser("special-pdf", help="A4-PDF für Sonderlagerorte")
+    p.add_argument("excel", help="Vorher erstellte Lagerliste (.xlsx, .csv, .parquet oder .feather)")
+    p.add_argument("-o", "--output", required=True, help="Ziel-PDF")
+    p.add_argument("--qr-cache-dir", help="Verzeichnis für den QR-Code-Cache auf der Festplatte")
+    _add_qr_backend_argument(p)
+    p.add_argument(
+        "--background-dpi",
+        type=int,
+        default=None,
+        help="Hintergrundgrafik vor dem Einbetten auf diese Auflösung verkleinern (z.B. 150)",
+    )
+    _add_profile_arguments(p)
+    p.set_defaults(func=cmd_special_pdf)
+
+    p = sub.add_parser(
+        "build", help="Lagerliste und PDFs direkt aus dem Regalaufbau erzeugen (ohne Excel-Liste einzulesen)"
+    )
+    _add_grid_arguments(p)
+    p.add_argument("--excel", help="Lagerliste zusätzlich speichern (.xlsx, .csv, .parquet oder .feather)")
+    p.add_argument("--a4", help="A4-PDF mit Etiketten im Raster")
+    p.add_argument("--single", help="PDF mit einem Etikett pro Seite")
+    p.add_argument("--special", help="A4-PDF für Sonderlagerorte")
+    _add_label_arguments(p)
+    _add_profile_arguments(p)
+    p.set_defaults(func=cmd_build)
+
+    p = sub.add_parser("convert", help="Lagerliste in ein anderes Format umwandeln (Format nach Dateiendung)")
+    p.add_argument("source", help="Vorhandene Lagerliste (.xlsx, .csv, .parquet oder .feather)")
+    p.add_argument("target", help="Zieldatei (.xlsx, .csv, .parquet oder .feather)")
+    _add_profile_arguments(p)
+    p.set_defaults(func=cmd_convert)
+
+    p = sub.add_parser("batch", help="Mehrere Standorte aus einer Manifest-Datei (JSON/TOML/YAML) erzeugen")
+    p.add_argument("manifest", help="Manifest mit Standorten, Regalaufbau, Formaten und Ausgaben")
+    p.add_argument("--workers", type=int, help="Standorte parallel in so vielen Prozessen (Standard aus dem Manifest)")
+    p.add_argument("--summary", help="Zusammenfassung (JSON), Standard: <output_dir>/batch_summary.json")
+    _add_profile_arguments(p)
+    p.set_defaults(func=cmd_batch)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.profile or args.profile_dump:
+        return _run_profiled(args)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,188 @@
+"""
+Etikettenformate.
+
+Die Formate (Etikettengröße, Raster auf dem Bogen, Position von QR-Code und
+Texten) stehen in einer JSON- oder TOML-Datei, standardmäßig label_formats.json
+neben diesem Modul. Eine eigene Datei kann über die Umgebungsvariable
+STOCKLIST_LABEL_FORMATS oder configure(path) gesetzt werden.
+
+Die Geometrie wird beim Laden einmal je Format in Punkt (PDF) berechnet; alle
+Renderer (PDF-Etiketten, A4-Raster, Vorschau) teilen sich dieselben
+LabelFormat-Objekte.
+"""
+import json
+import os
+from functools import lru_cache
+
+from reportlab.lib import pagesizes
+from reportlab.lib.pagesizes import mm
+
+
+DEFAULT_FORMATS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "label_formats.json")
+
+_formats_path = os.environ.get("STOCKLIST_LABEL_FORMATS") or DEFAULT_FORMATS_PATH
+
+
+class LabelFormat:
+    """
+    Ein Etikettenformat mit vorberechneter Geometrie (alle Längen in Punkt, außer *_mm).
+    """
+
+    def __init__(self, name, spec):
+        self.name = name
+        self.width_mm = spec["width_mm"]
+        self.height_mm = spec["height_mm"]
+        self.width = self.width_mm * mm
+        self.height = self.height_mm * mm
+
+        # QR-Code links, vertikal zentriert
+        self.qr_size_mm = spec["qr_size_mm"]
+        self.qr_x_mm = spec["qr_x_mm"]
+        self.qr_size = self.qr_size_mm * mm
+        self.qr_x = self.qr_x_mm * mm
+        self.qr_y = (self.height - self.qr_size) / 2
+
+        # Textbereich rechts vom QR-Code
+        self.text_x_mm = spec["text_x_mm"]
+        self.text_margin_mm = spec["text_margin_mm"]
+        self.text_x = self.text_x_mm * mm
+        self.text_w = self.width - self.text_x - self.text_margin_mm * mm
+        self.lagerort_pt = spec["lagerort_pt"]
+        self.lagerplatz_pt = spec["lagerplatz_pt"]
+        self.frame_line_width = spec["frame_line_width"]
+
+        # Bogen (z.B. A4) mit cols x rows Etiketten, zentriert
+        sheet = spec["sheet"]
+        self.cols = sheet["cols"]
+        self.rows = sheet["rows"]
+        self.sheet_size = getattr(pagesizes, sheet.get("page", "A4").upper())
+        page_w, page_h = self.sheet_size
+        self.x_margin = (page_w - self.cols * self.width) / 2
+        self.y_margin = (page_h - self.rows * self.height) / 2
+        self.cells = self._cell_origins()
+
+        # Vorschau (Pixel pro mm; Positionen und Schriftgrößen kommen aus stocklist.layout)
+        self.preview = dict(spec["preview"])
+
+    def _cell_origins(self):
+        # Linke untere Ecke jeder Zelle, zeilenweise von oben links
+        cells = []
+        y = self.sheet_size[1] - self.y_margin - self.height
+        for _ in range(self.rows):
+            x = self.x_margin
+            for _ in range(self.cols):
+                cells.append((x, y))
+                x += self.width
+            y -= self.height
+        return tuple(cells)
+
+    @property
+    def per_sheet(self):
+        return self.cols * self.rows
+
+    @property
+    def page_size(self):
+        # Seitengröße für ein Etikett pro Seite
+        return self.width, self.height
+
+    def specs(self):
+        """(label_w_mm, label_h_mm, cols, rows) wie bisher get_label_specs."""
+        return self.width_mm, self.height_mm, self.cols, self.rows
+
+    def __repr__(self):
+        return f"LabelFormat({self.name!r})"
+
+
+class FormatRegistry:
+    """
+    Alle Formate einer Datei; unbekannte Namen fallen auf das Standardformat zurück.
+    """
+
+    def __init__(self, formats, default):
+        self.formats = formats
+        self.default = default
+
+    def names(self):
+        return list(self.formats)
+
+    def find(self, name):
+        """
+        Format zu name ("70x32 mm" oder kurz "70x32"), None wenn unbekannt.
+        """
+        if name in self.formats:
+            return self.formats[name]
+        return self.formats.get(f"{name} mm")
+
+    def get(self, name=None):
+        return self.find(name) or self.formats[self.default]
+
+
+def read_config_file(path):
+    """
+    Liest eine Konfigurationsdatei nach Endung: .toml, .yaml/.yml (benötigt PyYAML), sonst JSON.
+    Wird auch für Batch-Manifeste genutzt (siehe stocklist.batch).
+    """
+    lower = path.lower()
+    if lower.endswith(".toml"):
+        import tomllib
+
+        with open(path, "rb") as f:
+            return tomllib.load(f)
+    if lower.endswith((".yaml", ".yml")):
+        try:
+            import yaml
+        except ImportError:
+            raise ValueError("Für YAML-Dateien wird PyYAML benötigt (pip install pyyaml)")
+        with open(path, encoding="utf-8") as f:
+            return yaml.safe_load(f)
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+@lru_cache(maxsize=8)
+def load_registry(path):
+    """
+    Liest eine Formatdatei (JSON oder TOML) und berechnet die Geometrie aller Formate.
+    Formatangaben überschreiben die gemeinsamen Werte aus "layout".
+    """
+    data = read_config_file(path)
+    layout = data.get("layout", {})
+    formats = {}
+    for name, fmt in data["formats"].items():
+        spec = {**layout, **fmt}
+        spec["preview"] = {**layout.get("preview", {}), **fmt.get("preview", {})}
+        formats[name] = LabelFormat(name, spec)
+    if not formats:
+        raise ValueError(f"Keine Etikettenformate in {path}")
+    default = data.get("default") or next(iter(formats))
+    if default not in formats:
+        raise ValueError(f"Standardformat {default!r} fehlt in {path}")
+    return FormatRegistry(formats, default)
+
+
+def configure(path=None):
+    """
+    Setzt die Formatdatei (None = mitgelieferte label_formats.json).
+    """
+    global _formats_path
+    _formats_path = path or DEFAULT_FORMATS_PATH
+    return get_registry()
+
+
+def formats_path():
+    return _formats_path
+
+
+def get_registry():
+    return load_registry(_formats_path)
+
+
+def get_format(name=None):
+    """
+    LabelFormat zu name (z.B. "70x32 mm"); unbekannte Namen liefern das Standardformat.
+    """
+    return get_registry().get(name)
+
+
+def format_names():
+    return get_registry().names()
@@ -0,0 +1,188 @@
+"""
+Inkrementelles Neuerzeugen von Etiketten-PDFs.
+
+Neben der PDF wird ein Manifest (<pdf>.manifest.json) mit einem Hash je
+Etikett und je Seite abgelegt. Beim nächsten Lauf werden nur die Seiten neu
+gerendert, deren Etiketten sich geändert haben; alle anderen Seiten werden
+unverändert aus der bisherigen PDF übernommen. Optional wird zusätzlich eine
+Delta-PDF mit nur den neuen bzw. geänderten Etiketten geschrieben (zum
+Nachdrucken nach einer Erweiterung oder Umbenennung).
+
+Ändern sich Format, Etikettenart oder QR-Ausgabe, fehlt die alte PDF bzw. das
+Manifest oder ist pypdf nicht installiert, wird wie bisher alles neu erzeugt.
+"""
+import hashlib
+import json
+import os
+from io import BytesIO
+
+from stocklist.formats import get_format
+from stocklist.pdf import labels_per_page, render_label_pdf
+from stocklist.profiling import count, stage
+
+
+MANIFEST_VERSION = 1
+MANIFEST_SUFFIX = ".manifest.json"
+
+
+def manifest_path(output_pdf):
+    return f"{output_pdf}{MANIFEST_SUFFIX}"
+
+
+def label_hash(record):
+    """
+    Hash eines Etiketts (QR-Daten, Lagerort, Lagerplatz).
+    """
+    return hashlib.sha256("\x1f".join(record).encode("utf-8")).hexdigest()[:32]
+
+
+def _settings(kind, fmt_value, qr_backend):
+    # Alles, was das Aussehen einer Seite bestimmt (außer den Etiketten selbst)
+    layout = get_format(fmt_value)
+    geometry = {k: v for k, v in vars(layout).items() if k != "preview"}
+    return {
+        "kind": kind,
+        "format": layout.name,
+        "geometry": hashlib.sha256(repr(sorted(geometry.items())).encode("utf-8")).hexdigest()[:32],
+        "qr_backend": qr_backend,
+    }
+
+
+def build_manifest(kind, fmt_value, qr_backend, records):
+    """
+    Manifest für die gegebenen Etiketten: Hash je Etikett und je Seite.
+    """
+    labels = [label_hash(r) for r in records]
+    per_page = labels_per_page(kind, fmt_value)
+    pages = [
+        hashlib.sha256("".join(labels[i:i + per_page]).encode("ascii")).hexdigest()[:32]
+        for i in range(0, len(labels), per_page)
+    ]
+    return {
+        "version": MANIFEST_VERSION,
+        "settings": _settings(kind, fmt_value, qr_backend),
+        "labels": labels,
+        "pages": pages,
+    }
+
+
+def load_manifest(output_pdf):
+    try:
+        with open(manifest_path(output_pdf), encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if manifest.get("version") != MANIFEST_VERSION:
+        return None
+    return manifest
+
+
+def save_manifest(output_pdf, manifest):
+    manifest = dict(manifest, pdf_size=os.path.getsize(output_pdf))
+    with open(manifest_path(output_pdf), "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+
+
+def _reusable(old, new, output_pdf):
+    # Alte PDF nur übernehmen, wenn sie zum Manifest passt und gleich aufgebaut ist
+    if old is None or old["settings"] != new["settings"]:
+        return False
+    try:
+        return os.path.getsize(output_pdf) == old.get("pdf_size")
+    except OSError:
+        return False
+
+
+def changed_records(records, old_manifest):
+    """
+    Etiketten, die im alten Manifest nicht vorkommen (neu oder geändert).
+    """
+    known = set(old_manifest["labels"]) if old_manifest else set()
+    return [r for r in records if label_hash(r) not in known]
+
+
+def _changed_runs(old_pages, new_pages):
+    # Zusammenhängende Bereiche geänderter Seiten als (start, ende)
+    runs = []
+    start = None
+    for i, page in enumerate(new_pages):
+        changed = i >= len(old_pages) or old_pages[i] != page
+        if changed and start is None:
+            start = i
+        elif not changed and start is not None:
+            runs.append((start, i))
+            start = None
+    if start is not None:
+        runs.append((start, len(new_pages)))
+    return runs
+
+
+def _patch_pdf(kind, output_pdf, records, fmt_value, qr_backend, old_pages, new_pages):
+    from pypdf import PdfReader, PdfWriter
+
+    per_page = labels_per_page(kind, fmt_value)
+    rendered = {}
+    for start, end in _changed_runs(old_pages, new_pages):
+        buf = BytesIO()
+        render_label_pdf(kind, buf, records[start * per_page:end * per_page], fmt_value, qr_backend, invariant=1)
+        for offset, page in enumerate(PdfReader(buf).pages):
+            rendered[start + offset] = page
+
+    old_reader = PdfReader(output_pdf)
+    writer = PdfWriter()
+    for i in range(len(new_pages)):
+        writer.add_page(rendered[i] if i in rendered else old_reader.pages[i])
+
+    # Erst vollständig schreiben, dann ersetzen (die alte PDF wird noch gelesen)
+    tmp = f"{output_pdf}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        writer.write(f)
+    os.replace(tmp, output_pdf)
+    return len(rendered)
+
+
+def render_incremental(kind, output_pdf, records, fmt_value, qr_backend, delta_pdf=None, workers=None):
+    """
+    Aktualisiert output_pdf anhand des Manifests und rendert nur geänderte Seiten neu.
+    Mit delta_pdf werden die neuen/geänderten Etiketten zusätzlich in eine eigene PDF geschrieben.
+    Liefert {"pages": ..., "rendered": ..., "reused": ..., "delta_labels": ...}.
+    """
+    records = list(records)
+    with stage("manifest"):
+        old = load_manifest(output_pdf)
+        new = build_manifest(kind, fmt_value, qr_backend, records)
+        reusable = _reusable(old, new, output_pdf)
+
+    delta_labels = None
+    if delta_pdf:
+        delta = changed_records(records, old if reusable else None)
+        delta_labels = len(delta)
+        with stage("delta_pdf"):
+            render_label_pdf(kind, delta_pdf, delta, fmt_value, qr_backend)
+
+    try:
+        import pypdf  # noqa: F401
+    except ImportError:
+        reusable = False
+
+    if reusable and new["pages"]:
+        with stage("patch_pdf"):
+            rendered = _patch_pdf(kind, output_pdf, records, fmt_value, qr_backend, old["pages"], new["pages"])
+    else:
+        if workers:
+            from stocklist.parallel import render_sharded
+
+            render_sharded(kind, output_pdf, records, fmt_value, qr_backend, workers)
+        else:
+            render_label_pdf(kind, output_pdf, records, fmt_value, qr_backend)
+        rendered = len(new["pages"])
+
+    save_manifest(output_pdf, new)
+    count("pages_rendered", rendered)
+    count("pages_reused", len(new["pages"]) - rendered)
+    return {
+        "pages": len(new["pages"]),
+        "rendered": rendered,
+        "reused": len(new["pages"]) - rendered,
+        "delta_labels": delta_labels,
+    }
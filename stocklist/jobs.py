@@ -0,0 +1,154 @@
+"""
+Hintergrund-Jobs für die GUI.
+
+Lange PDF-Läufe werden nacheinander in einem eigenen Thread abgearbeitet,
+damit das Fenster bedienbar bleibt. Die Job-Funktionen bekommen einen
+progress-Callback (erledigt, gesamt), über den auch abgebrochen wird: nach
+cancel() löst der nächste Aufruf JobCancelled aus.
+
+Der Runner fasst tkinter nicht an. Zustandsänderungen landen in einer Queue,
+die die GUI mit root.after regelmäßig über poll() abholt.
+"""
+import itertools
+import queue
+import threading
+import time
+
+
+class JobCancelled(Exception):
+    """Der Job wurde über cancel() abgebrochen."""
+
+
+class Job:
+    """
+    Ein Eintrag in der Warteschlange (Status: wartend, läuft, fertig, abgebrochen, fehler).
+    meta enthält Angaben des Aufrufers (z.B. Ausgabedatei für die Meldung am Ende), die func nicht bekommt.
+    """
+
+    _ids = itertools.count(1)
+
+    def __init__(self, name, func, args, kwargs, meta=None):
+        self.id = next(self._ids)
+        self.name = name
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.meta = dict(meta or {})
+        self.status = "wartend"
+        self.done = 0
+        self.total = None
+        self.result = None
+        self.error = None
+        self._cancel = threading.Event()
+
+    def cancel(self):
+        self._cancel.set()
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def __repr__(self):
+        return f"Job({self.id}, {self.name!r}, {self.status})"
+
+
+class JobRunner:
+    """
+    Arbeitet Jobs der Reihe nach in einem Hintergrund-Thread ab.
+
+    Ereignisse (art, job) mit art in "queued", "started", "progress", "done", "cancelled", "error"
+    werden in eine Queue gestellt und von poll() im GUI-Thread abgeholt.
+    """
+
+    PROGRESS_INTERVAL = 0.1  # Sekunden zwischen zwei Fortschrittsmeldungen je Job
+
+    def __init__(self):
+        self._jobs = queue.Queue()
+        self._events = queue.Queue()
+        self._pending = []
+        self._lock = threading.Lock()
+        self.current = None
+        self._thread = threading.Thread(target=self._work, name="stocklist-jobs", daemon=True)
+        self._thread.start()
+
+    def submit(self, name, func, *args, meta=None, **kwargs):
+        """
+        Stellt func(*args, progress=..., **kwargs) in die Warteschlange und liefert den Job.
+        meta (dict) wird als job.meta gesetzt, bevor der Job in die Warteschlange kommt.
+        """
+        job = Job(name, func, args, kwargs, meta)
+        with self._lock:
+            self._pending.append(job)
+        self._events.put(("queued", job))
+        self._jobs.put(job)
+        return job
+
+    def pending(self):
+        """Wartende Jobs (ohne den laufenden)."""
+        with self._lock:
+            return list(self._pending)
+
+    def cancel_current(self):
+        job = self.current
+        if job is not None:
+            job.cancel()
+        return job
+
+    def cancel_all(self):
+        for job in self.pending():
+            job.cancel()
+        self.cancel_current()
+
+    def poll(self):
+        """
+        Liefert alle seit dem letzten Aufruf angefallenen Ereignisse (blockiert nicht).
+        """
+        events = []
+        while True:
+            try:
+                events.append(self._events.get_nowait())
+            except queue.Empty:
+                return events
+
+    def _progress_callback(self, job):
+        last = [0.0]
+
+        def progress(done, total=None):
+            if job.cancelled:
+                raise JobCancelled(job.name)
+            job.done = done
+            job.total = total
+            now = time.monotonic()
+            if now - last[0] >= self.PROGRESS_INTERVAL or (total is not None and done >= total):
+                last[0] = now
+                self._events.put(("progress", job))
+
+        return progress
+
+    def _work(self):
+        while True:
+            job = self._jobs.get()
+            with self._lock:
+                self._pending.remove(job)
+            if job.cancelled:
+                job.status = "abgebrochen"
+                self._events.put(("cancelled", job))
+                continue
+
+            self.current = job
+            job.status = "läuft"
+            self._events.put(("started", job))
+            try:
+                job.result = job.func(*job.args, progress=self._progress_callback(job), **job.kwargs)
+            except JobCancelled:
+                job.status = "abgebrochen"
+                self._events.put(("cancelled", job))
+            except Exception as e:
+                job.status = "fehler"
+                job.error = e
+                self._events.put(("error", job))
+            else:
+                job.status = "fertig"
+                self._events.put(("done", job))
+            finally:
+                self.current = None
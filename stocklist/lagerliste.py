@@ -0,0 +1,402 @@
+import string
+
+import numpy as np
+import pandas as pd
+
+from stocklist.profiling import count, stage
+
+
+# ----------------------------
+# Hilfsfunktionen für Daten
+# ----------------------------
+
+COLUMNS = ["Lagerort", "Regal", "Fach", "Ebene", "Daten für QR-Code", "LO", "LP", "Sonderlagerorte"]
+
+# Bei mehreren Radsätzen pro Fach (wie script/main.py) kommt Spalte I "Radsatz" hinzu;
+# die Spalten A-H bleiben an ihrer Stelle, damit Druckvorlagen weiter passen.
+RADSATZ_COLUMN = "Radsatz"
+
+
+def columns_for(radsaetze=1):
+    """
+    Spaltennamen der Lagerliste (mit "Radsatz" nur bei mehr als einem Radsatz pro Fach).
+    """
+    return COLUMNS + [RADSATZ_COLUMN] if radsaetze > 1 else list(COLUMNS)
+
+
+def regal_labels_for(regal_typ, regale):
+    """
+    Regalbezeichnungen absteigend (Buchstaben: max. A-Z, sonst 1..regale).
+    """
+    if regal_typ == "Buchstaben":
+        regal_labels = list(string.ascii_uppercase)[:regale]
+    else:
+        regal_labels = [str(i + 1) for i in range(regale)]
+    return regal_labels[::-1]  # absteigend
+
+
+def _grid_columns(lagerort, regal_labels, faecher, ebenen, radsaetze=1):
+    """
+    Baut die Spalten A-G für das Raster Regal × Fach × Ebene (× Radsatz), jeweils absteigend,
+    bei radsaetze > 1 zusätzlich die Spalte "Radsatz".
+    Fach/Ebene/Radsatz kommen als NumPy-Arrays, wiederholte Texte (Lagerort, Regal, LO) teilen sich ein Objekt.
+    Die Lagerplatz-Texte werden aus "Regal-" und den einmal erzeugten "Fach-Ebene(-Radsatz)"-Texten
+    zusammengesetzt, LO/LP werden direkt gebaut statt "Daten für QR-Code" wieder aufzutrennen.
+    """
+    n_regale = len(regal_labels)
+    per_fach = ebenen * radsaetze
+    per_regal = faecher * per_fach
+    n = n_regale * per_regal
+
+    fach = np.tile(np.repeat(np.arange(faecher, 0, -1, dtype=np.int64), per_fach), n_regale)
+    ebene = np.tile(np.repeat(np.arange(ebenen, 0, -1, dtype=np.int64), radsaetze), n_regale * faecher)
+    regal = np.repeat(np.array(regal_labels, dtype=object), per_regal)
+
+    if radsaetze > 1:
+        fach_ebene = [
+            f"{f}-{e}-{rs}"
+            for f in range(faecher, 0, -1) for e in range(ebenen, 0, -1) for rs in range(radsaetze, 0, -1)
+        ]
+    else:
+        fach_ebene = [f"{f}-{e}" for f in range(faecher, 0, -1) for e in range(ebenen, 0, -1)]
+    lagerplatz = [f"{r}-" + fe for r in regal_labels for fe in fach_ebene]
+    qr_prefix = f"{lagerort};"
+    qr_data = [qr_prefix + lp for lp in lagerplatz]
+
+    # LO/LP entsprechen "Daten für QR-Code" getrennt am ersten ";"
+    lo, sep, rest = lagerort.partition(";")
+    if sep:
+        lagerplatz = [f"{rest};" + lp for lp in lagerplatz]
+
+    columns = {
+        "Lagerort": np.full(n, lagerort, dtype=object),
+        "Regal": regal,
+        "Fach": fach,
+        "Ebene": ebene,
+        "Daten für QR-Code": np.array(qr_data, dtype=object),
+        "LO": np.full(n, lo, dtype=object),
+        "LP": np.array(lagerplatz, dtype=object),
+    }
+    if radsaetze > 1:
+        columns[RADSATZ_COLUMN] = np.tile(np.arange(radsaetze, 0, -1, dtype=np.int64), n // radsaetze)
+    return columns
+
+
+def generate_lagerliste(lagerort, regal_typ, regale, faecher, ebenen, sonderorte, radsaetze=1):
+    """
+    Erzeugt die Excel-Liste wie gewünscht:
+    - Zuerst normale Lagerplätze (Spalten A-G gefüllt, inkl. QR-Daten in E sowie LO/LP).
+    - Sonderlagerorte werden von ganz oben beginnend in Spalte H eingetragen (= über vorhandene Zeilen),
+      ohne neue Zeilen zu erzwingen. Falls mehr Sonderlagerorte existieren als normale Zeilen, werden
+      zusätzliche Zeilen am Ende angefügt, in denen ausschließlich Spalte H gefüllt ist.
+    Spalten: A Lagerort, B Regal, C Fach, D Ebene, E Daten für QR-Code, F LO, G LP, H Sonderlagerorte
+    Mit radsaetze > 1 bekommt jedes Fach/Ebene so viele Lagerplätze (Lagerplatz "Regal-Fach-Ebene-Radsatz"),
+    die Nummer steht zusätzlich in Spalte I "Radsatz".
+    """
+    # Sonderorte bereinigen (leere Zeilen raus)
+    sonder_clean = [o.strip() for o in sonderorte if o.strip()]
+
+    # 1) Normale Lagerplätze (wenn definiert)
+    names = columns_for(radsaetze)
+    if regale > 0 and faecher > 0 and ebenen > 0 and lagerort:
+        columns = _grid_columns(lagerort, regal_labels_for(regal_typ, regale), faecher, ebenen, max(1, radsaetze))
+    else:
+        columns = {name: np.empty(0, dtype=object) for name in names if name != "Sonderlagerorte"}
+    n = len(columns["Regal"])
+
+    # Falls mehr Sonderlagerorte als normale Zeilen: zusätzliche Zeilen am Ende, nur Spalte H befüllt.
+    # Alle Spalten werden einmal auf die Endgröße gebracht (kein zeilenweises pd.concat).
+    total = max(n, len(sonder_clean))
+    if total > n:
+        fill = np.full(total - n, "", dtype=object)
+        columns = {name: np.concatenate([np.asarray(col, dtype=object), fill]) for name, col in columns.items()}
+
+    # 2) Sonderlagerorte in Spalte H von oben eintragen (eine Spaltenzuweisung)
+    columns["Sonderlagerorte"] = np.array(sonder_clean + [""] * (total - len(sonder_clean)), dtype=object)
+
+    df = pd.DataFrame(columns, columns=names)
+    return df
+
+
+def _column_widths(columns):
+    # Spalte I (Radsatz) nur, wenn vorhanden (sonst bleibt die Datei wie bisher)
+    if RADSATZ_COLUMN in columns:
+        return COLUMN_WIDTHS_PX + [RADSATZ_WIDTH_PX]
+    return COLUMN_WIDTHS_PX
+
+
+def write_excel(df, file_path):
+    """
+    Speichert die Lagerliste als Excel-Datei.
+    Gibt True zurück, wenn die Spaltenbreiten gesetzt werden konnten, sonst False.
+    """
+    # Versuche Pixelbreiten mit XlsxWriter zu setzen; Fallback auf OpenPyXL mit Zeichenbreiten
+    try:
+        with pd.ExcelWriter(file_path, engine="xlsxwriter") as writer:
+            sheet_name = "Tabelle1"
+            df.to_excel(writer, index=False, sheet_name=sheet_name)
+            worksheet = writer.sheets[sheet_name]
+            # Spaltenbreiten exakt in Pixeln setzen
+            for cols, px in _column_widths(df.columns):
+                worksheet.set_column_pixels(cols, px)
+        return True
+    except Exception:
+        pass
+
+    # Fallback (OpenPyXL): Breite in "Zeichen" annähern (~ 1 Zeichen ≈ 7 Pixel)
+    def px_to_chars(px):
+        return round(px / 7.0, 1)
+
+    try:
+        with pd.ExcelWriter(file_path, engine="openpyxl") as writer:
+            sheet_name = "Tabelle1"
+            df.to_excel(writer, index=False, sheet_name=sheet_name)
+            ws = writer.sheets[sheet_name]
+            ws.column_dimensions['A'].width = px_to_chars(150)
+            ws.column_dimensions['B'].width = px_to_chars(80)
+            ws.column_dimensions['C'].width = px_to_chars(80)
+            ws.column_dimensions['D'].width = px_to_chars(80)
+            ws.column_dimensions['E'].width = px_to_chars(250)
+            ws.column_dimensions['F'].width = px_to_chars(150)
+            ws.column_dimensions['G'].width = px_to_chars(150)
+            ws.column_dimensions['H'].width = px_to_chars(250)
+            if RADSATZ_COLUMN in df.columns:
+                ws.column_dimensions['I'].width = px_to_chars(RADSATZ_WIDTH_PX[1])
+        return True
+    except Exception:
+        # Letzter Fallback: ohne Formatierung speichern
+        df.to_excel(file_path, index=False)
+        return False
+
+
+# Spaltenbreiten in Pixeln (XlsxWriter set_column_pixels)
+COLUMN_WIDTHS_PX = [
+    ("A:A", 150),  # Lagerort
+    ("B:D", 80),   # Regal, Fach, Ebene
+    ("E:E", 250),  # Daten für QR-Code
+    ("F:G", 150),  # LO, LP
+    ("H:H", 250),  # Sonderlagerorte
+]
+RADSATZ_WIDTH_PX = ("I:I", 80)
+
+
+def iter_lagerliste_rows(lagerort, regal_typ, regale, faecher, ebenen, sonderorte, radsaetze=1):
+    """
+    Liefert die Zeilen der Lagerliste (Spalten A-H bzw. A-I mit Radsatz, gleiche Reihenfolge wie
+    generate_lagerliste) einzeln als Tupel, ohne die ganze Liste im Speicher aufzubauen.
+    """
+    sonder_clean = [o.strip() for o in sonderorte if o.strip()]
+    n_sonder = len(sonder_clean)
+    i = 0
+
+    if regale > 0 and faecher > 0 and ebenen > 0 and lagerort:
+        qr_prefix = f"{lagerort};"
+        # LO/LP entsprechen "Daten für QR-Code" getrennt am ersten ";"
+        lo, sep, rest = lagerort.partition(";")
+        lp_prefix = f"{rest};" if sep else ""
+
+        if radsaetze > 1:
+            for regal in regal_labels_for(regal_typ, regale):
+                for fach in range(faecher, 0, -1):
+                    for ebene in range(ebenen, 0, -1):
+                        prefix = f"{regal}-{fach}-{ebene}-"
+                        for rs in range(radsaetze, 0, -1):
+                            lagerplatz = prefix + str(rs)
+                            sonder = sonder_clean[i] if i < n_sonder else ""
+                            yield (
+                                lagerort, regal, fach, ebene, qr_prefix + lagerplatz, lo, lp_prefix + lagerplatz,
+                                sonder, rs,
+                            )
+                            i += 1
+        else:
+            for regal in regal_labels_for(regal_typ, regale):
+                for fach in range(faecher, 0, -1):
+                    for ebene in range(ebenen, 0, -1):
+                        lagerplatz = f"{regal}-{fach}-{ebene}"
+                        sonder = sonder_clean[i] if i < n_sonder else ""
+                        yield (lagerort, regal, fach, ebene, qr_prefix + lagerplatz, lo, lp_prefix + lagerplatz, sonder)
+                        i += 1
+
+    # Überzählige Sonderlagerorte: nur Spalte H befüllt (mit Radsatz-Spalte ebenfalls leer)
+    tail = ("",) * (len(columns_for(radsaetze)) - len(COLUMNS))
+    for ort in sonder_clean[i:]:
+        yield ("", "", "", "", "", "", "", ort) + tail
+
+
+def write_excel_stream(rows, file_path, columns=COLUMNS):
+    """
+    Schreibt Zeilen (z.B. aus iter_lagerliste_rows) direkt mit XlsxWriter im constant_memory-Modus:
+    jede Zeile wird sofort auf die Platte geschrieben, der Speicherbedarf bleibt unabhängig von der Zeilenzahl.
+    Kopfzeile (columns) und Spaltenbreiten wie bei write_excel.
+    """
+    import xlsxwriter
+
+    workbook = xlsxwriter.Workbook(file_path, {"constant_memory": True})
+    try:
+        worksheet = workbook.add_worksheet("Tabelle1")
+        for cols, px in _column_widths(columns):
+            worksheet.set_column_pixels(cols, px)
+
+        # Kopfzeile wie bei pandas.to_excel (fett, Rahmen, zentriert)
+        header_fmt = workbook.add_format({"bold": True, "border": 1, "align": "center", "valign": "top"})
+        worksheet.write_row(0, 0, columns, header_fmt)
+
+        row_idx = 1
+        for row in rows:
+            worksheet.write_row(row_idx, 0, row)
+            row_idx += 1
+        count("rows", row_idx - 1)
+    finally:
+        with stage("excel_close"):
+            workbook.close()
+
+
+def write_lagerliste_excel(file_path, lagerort, regal_typ, regale, faecher, ebenen, sonderorte, radsaetze=1):
+    """
+    Erzeugt die Lagerliste und schreibt sie zeilenweise als Excel-Datei (ohne DataFrame).
+    Ohne XlsxWriter wird auf generate_lagerliste + write_excel zurückgegriffen.
+    Gibt True zurück, wenn die Spaltenbreiten gesetzt werden konnten, sonst False.
+    """
+    try:
+        import xlsxwriter  # noqa: F401
+    except ImportError:
+        with stage("generate"):
+            df = generate_lagerliste(lagerort, regal_typ, regale, faecher, ebenen, sonderorte, radsaetze)
+        with stage("excel_write"):
+            return write_excel(df, file_path)
+
+    rows = iter_lagerliste_rows(lagerort, regal_typ, regale, faecher, ebenen, sonderorte, radsaetze)
+    with stage("excel_write"):
+        write_excel_stream(rows, file_path, columns_for(radsaetze))
+    return True
+
+
+# ----------------------------
+# Lagerplätze direkt aus dem Regalaufbau (ohne Liste/DataFrame)
+# ----------------------------
+
+class Location:
+    """
+    Ein Lagerplatz: Lagerort, Regal, Fach, Ebene, Radsatz (None bei einem Radsatz pro Fach),
+    Lagerplatz-Text ("Regal-Fach-Ebene[-Radsatz]") und QR-Inhalt ("Lagerort;Lagerplatz").
+    """
+
+    __slots__ = ("lagerort", "regal", "fach", "ebene", "radsatz", "lagerplatz", "qr")
+
+    def __init__(self, lagerort, regal, fach, ebene, radsatz, lagerplatz, qr):
+        self.lagerort = lagerort
+        self.regal = regal
+        self.fach = fach
+        self.ebene = ebene
+        self.radsatz = radsatz
+        self.lagerplatz = lagerplatz
+        self.qr = qr
+
+    def label(self):
+        """(QR-Daten, Lagerort, Lagerplatz) wie stocklist.pdf.read_label_records."""
+        return self.qr, self.lagerort, self.lagerplatz
+
+    def __repr__(self):
+        return f"Location({self.qr!r})"
+
+
+def _location_axes(regal_typ, regale, faecher, ebenen, radsaetze, ascending, selection=None):
+    axes = [
+        regal_labels_for(regal_typ, regale),
+        list(range(faecher, 0, -1)),
+        list(range(ebenen, 0, -1)),
+        list(range(radsaetze, 0, -1)),
+    ]
+    if ascending:
+        axes = [axis[::-1] for axis in axes]
+    if selection:
+        # Die Auswahl gilt je Achse, also wird gar nicht erst über nicht gewählte Werte iteriert
+        # (ohne Radsätze hat ein Lagerplatz keinen Radsatz, wie in der Excel-Liste)
+        axes[0] = selection.select("regale", axes[0])
+        axes[1] = selection.select("faecher", axes[1])
+        axes[2] = selection.select("ebenen", axes[2])
+        if radsaetze > 1:
+            axes[3] = selection.select("radsaetze", axes[3])
+        elif not selection.select("radsaetze", [None]):
+            axes[3] = []
+    return axes
+
+
+def iter_locations(lagerort, regal_typ, regale, faecher, ebenen, radsaetze=1, ascending=False, selection=None):
+    """
+    Liefert die Lagerplätze (Location) einzeln direkt aus dem Regalaufbau, mit konstantem Speicherbedarf.
+    ascending=False: Reihenfolge der Lagerliste (alles absteigend, wie generate_lagerliste).
+    ascending=True: Druckreihenfolge der Etiketten-PDFs (umgekehrt, wie read_label_records).
+    selection (stocklist.reader.LabelSelection) liefert nur die ausgewählten Lagerplätze.
+    """
+    if not (regale > 0 and faecher > 0 and ebenen > 0 and lagerort):
+        return
+    regal_labels, faecher_range, ebenen_range, radsatz_range = _location_axes(
+        regal_typ, regale, faecher, ebenen, max(1, radsaetze), ascending, selection
+    )
+    if not radsatz_range:
+        return
+    qr_prefix = f"{lagerort};"
+    for regal in regal_labels:
+        for fach in faecher_range:
+            for ebene in ebenen_range:
+                lagerplatz = f"{regal}-{fach}-{ebene}"
+                if radsaetze > 1:
+                    for rs in radsatz_range:
+                        lp = f"{lagerplatz}-{rs}"
+                        yield Location(lagerort, regal, fach, ebene, rs, lp, qr_prefix + lp)
+                else:
+                    yield Location(lagerort, regal, fach, ebene, None, lagerplatz, qr_prefix + lagerplatz)
+
+
+def count_locations(lagerort, regal_typ, regale, faecher, ebenen, radsaetze=1, selection=None):
+    """Anzahl der Lagerplätze, die iter_locations liefert (ohne sie zu erzeugen)."""
+    if not (regale > 0 and faecher > 0 and ebenen > 0 and lagerort):
+        return 0
+    n = 1
+    for axis in _location_axes(regal_typ, regale, faecher, ebenen, max(1, radsaetze), False, selection):
+        n *= len(axis)
+    return n
+
+
+class LocationLabels:
+    """
+    Etiketten (QR-Daten, Lagerort, Lagerplatz) für einen Regalaufbau, ohne Excel-Liste.
+    Kann wie eine Liste an die PDF-Renderer übergeben werden (mit len() für die Fortschrittsanzeige),
+    die Etiketten werden aber erst beim Durchlaufen erzeugt. Standard ist die Druckreihenfolge.
+    """
+
+    def __init__(self, lagerort, regal_typ, regale, faecher, ebenen, radsaetze=1, ascending=True, selection=None):
+        self.grid = (lagerort, regal_typ, regale, faecher, ebenen, radsaetze)
+        self.ascending = ascending
+        self.selection = selection
+
+    def __len__(self):
+        return count_locations(*self.grid, selection=self.selection)
+
+    def __iter__(self):
+        for location in iter_locations(*self.grid, ascending=self.ascending, selection=self.selection):
+            yield location.qr, location.lagerort, location.lagerplatz
+
+
+def format_val(val):
+    if pd.notna(val):
+        try:
+            if float(val).is_integer():
+                return str(int(val))
+        except Exception:
+            pass
+        return str(val)
+    return ""
+
+
+def format_column(values):
+    """
+    Spaltenweise Variante von format_val (Ergebnis als Series von Texten).
+    Regal/Fach/Ebene haben nur wenige verschiedene Werte, daher wird format_val nur
+    einmal je eindeutigem Wert aufgerufen und das Ergebnis per Index verteilt.
+    """
+    codes, uniques = pd.factorize(pd.Series(values), use_na_sentinel=True)
+    # Letzter Eintrag "" für leere Zellen (Code -1)
+    texts = np.array([format_val(u) for u in uniques] + [""], dtype=object)
+    return pd.Series(texts[codes], dtype=object)
@@ -0,0 +1,111 @@
+"""
+Gemeinsame Layout-Berechnung für Etiketten.
+
+Für ein Etikett (Format, Lagerort, Lagerplatz) werden QR-Feld, Schriftgrößen
+und Textpositionen einmal berechnet und zwischengespeichert. Der PDF-Renderer
+(stocklist.pdf) und die Vorschau (stocklist.preview) zeichnen beide nach
+diesem Ergebnis, so entspricht die Vorschau dem Druck.
+
+Alle Angaben sind in Punkt, Ursprung unten links (wie ReportLab). Maßgeblich
+für die Schriftgrößen sind die Helvetica-Metriken aus ReportLab.
+"""
+import math
+from functools import lru_cache
+
+from reportlab.pdfbase.pdfmetrics import stringWidth
+
+
+LAGERORT_FONT = "Helvetica"
+LAGERPLATZ_FONT = "Helvetica-Bold"
+
+
+@lru_cache(maxsize=8192)
+def fit_font_size(text, font_name, max_width, max_font_size, min_font_size=6):
+    """
+    Größte Schriftgröße (in 0,5-pt-Schritten ab max_font_size), bei der text in max_width passt.
+    """
+    if not text:
+        return min_font_size
+    # Textbreite ist proportional zur Schriftgröße: Breite bei 1 pt einmal messen und hochrechnen,
+    # danach mit echter Messung auf den 0,5-pt-Raster korrigieren (gleiches Ergebnis wie die Schleife).
+    steps = int((max_font_size - min_font_size) / 0.5)
+    if steps < 0:
+        return min_font_size
+
+    def fits(k):
+        return stringWidth(text, font_name, max_font_size - 0.5 * k) <= max_width
+
+    width_1pt = stringWidth(text, font_name, 1)
+    k = 0
+    if width_1pt > 0:
+        k = min(steps + 1, max(0, math.ceil((max_font_size - max_width / width_1pt) / 0.5)))
+    while k > 0 and fits(k - 1):
+        k -= 1
+    while k <= steps and not fits(k):
+        k += 1
+    if k > steps:
+        return min_font_size
+    return max_font_size - 0.5 * k
+
+
+class TextLine:
+    """
+    Eine Textzeile: linke Kante x, Grundlinie y, Schrift und Größe (in Punkt) sowie Breite.
+    """
+
+    __slots__ = ("text", "x", "y", "font", "size", "width")
+
+    def __init__(self, text, x, y, font, size, width):
+        self.text = text
+        self.x = x
+        self.y = y
+        self.font = font
+        self.size = size
+        self.width = width
+
+
+class LabelLayout:
+    """
+    Fertig berechnetes Etikett relativ zur linken unteren Ecke: QR-Feld und die zwei Textzeilen.
+    """
+
+    __slots__ = ("format", "qr_x", "qr_y", "qr_size", "lagerort", "lagerplatz")
+
+    def __init__(self, fmt, lagerort, lagerplatz):
+        self.format = fmt
+        self.qr_x = fmt.qr_x
+        self.qr_y = fmt.qr_y
+        self.qr_size = fmt.qr_size
+
+        # Texte rechts vom QR-Code, als Block (Lagerort, Lagerplatz, Leerraum) vertikal zentriert
+        fs_lo = fit_font_size(lagerort, LAGERORT_FONT, fmt.text_w, fmt.lagerort_pt)
+        fs_lp = fit_font_size(lagerplatz, LAGERPLATZ_FONT, fmt.text_w, fmt.lagerplatz_pt)
+        total_h = fs_lo + fs_lp + fs_lo
+        start_y = (fmt.height - total_h) / 2
+
+        tw = stringWidth(lagerort, LAGERORT_FONT, fs_lo)
+        self.lagerort = TextLine(
+            lagerort, fmt.text_x + (fmt.text_w - tw) / 2, start_y + fs_lp + fs_lo, LAGERORT_FONT, fs_lo, tw
+        )
+        tw = stringWidth(lagerplatz, LAGERPLATZ_FONT, fs_lp)
+        self.lagerplatz = TextLine(
+            lagerplatz, fmt.text_x + (fmt.text_w - tw) / 2, start_y, LAGERPLATZ_FONT, fs_lp, tw
+        )
+
+
+@lru_cache(maxsize=4096)
+def label_layout(fmt, lagerort, lagerplatz):
+    """
+    Layout für (LabelFormat, Lagerort, Lagerplatz), je Kombination nur einmal berechnet.
+    """
+    return LabelLayout(fmt, lagerort, lagerplatz)
+
+
+def split_label_text(input_text):
+    """
+    Zerlegt 'Lagerort;Lagerplatz' in die beiden Anzeige-Texte.
+    """
+    if ";" in input_text:
+        lagerort, lagerplatz = input_text.split(";", 1)
+        return lagerort, lagerplatz
+    return input_text, ""
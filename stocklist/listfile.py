@@ -0,0 +1,148 @@
+"""
+Lagerliste in anderen Dateiformaten als Excel.
+
+Die Etikettendrucker-Software braucht weiterhin die .xlsx-Datei. Für die
+PDF-Erzeugung und andere Werkzeuge kann die Liste zusätzlich (oder statt
+dessen) gespeichert werden als:
+- .csv (UTF-8 mit BOM, Trennzeichen ","), zeilenweise geschrieben und gelesen,
+- .parquet bzw. .feather (pyarrow, optional): spaltenweise gespeichert mit festen
+  Spaltentypen, sehr schnell einlesbar. Feather wird unkomprimiert geschrieben,
+  damit es beim Lesen ohne Kopie per Memory-Mapping genutzt werden kann.
+
+Das Format ergibt sich aus der Dateiendung (siehe stocklist.reader.detect_format),
+die PDF-Funktionen erkennen es beim Einlesen automatisch.
+"""
+import csv
+import itertools
+import os
+
+from stocklist.lagerliste import (
+    RADSATZ_COLUMN, columns_for, iter_lagerliste_rows, write_excel_stream, write_lagerliste_excel,
+)
+from stocklist.profiling import count, stage, timed_iter
+from stocklist.reader import cell_text, detect_format, iter_sheet_rows, require_pyarrow, sheet_columns
+
+
+# Spalten mit ganzen Zahlen (in Parquet/Feather int64, leere Zellen als null), alle anderen sind Text
+INT_COLUMNS = ("Fach", "Ebene", RADSATZ_COLUMN)
+
+# Zeilen pro RecordBatch bzw. Parquet-Row-Group
+ARROW_BATCH_ROWS = 65536
+
+
+def write_csv_stream(rows, file_path, columns):
+    """
+    Schreibt Zeilen (z.B. aus iter_lagerliste_rows) zeilenweise als CSV mit Kopfzeile columns.
+    """
+    # BOM, damit Excel die Umlaute beim Öffnen richtig anzeigt
+    with open(file_path, "w", encoding="utf-8-sig", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(columns)
+        n = 0
+        for row in rows:
+            writer.writerow(row)
+            n += 1
+    count("rows", n)
+
+
+def _arrow_value(val):
+    return None if val == "" else val
+
+
+def write_arrow_stream(rows, file_path, columns, fmt="parquet"):
+    """
+    Schreibt Zeilen blockweise (ARROW_BATCH_ROWS) als Parquet- oder Feather-Datei,
+    der Speicherbedarf hängt nicht von der Zeilenzahl ab. Leere Zellen ("" oder None) werden zu null.
+    """
+    pa = require_pyarrow()
+    schema = pa.schema([(name, pa.int64() if name in INT_COLUMNS else pa.string()) for name in columns])
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+
+        writer = pq.ParquetWriter(file_path, schema)
+    else:
+        # Feather (Version 2) ist eine Arrow-IPC-Datei
+        writer = pa.ipc.new_file(file_path, schema)
+
+    n = 0
+    try:
+        rows = iter(rows)
+        while True:
+            chunk = list(itertools.islice(rows, ARROW_BATCH_ROWS))
+            if not chunk:
+                break
+            # Spaltenweise nach Position; kürzere Zeilen werden mit null aufgefüllt statt abgeschnitten
+            arrays = [
+                pa.array([_arrow_value(row[i]) if i < len(row) else None for row in chunk], type=field.type)
+                for i, field in enumerate(schema)
+            ]
+            writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+            n += len(chunk)
+    finally:
+        writer.close()
+    count("rows", n)
+
+
+def write_rows(rows, file_path, columns):
+    """
+    Schreibt Zeilen im Format der Dateiendung (.xlsx, .csv, .parquet, .feather).
+    """
+    fmt = detect_format(file_path)
+    if fmt == "xlsx":
+        write_excel_stream(rows, file_path, columns)
+    elif fmt == "csv":
+        write_csv_stream(rows, file_path, columns)
+    elif fmt in ("parquet", "feather"):
+        write_arrow_stream(rows, file_path, columns, fmt)
+    else:
+        raise ValueError(f"Nicht unterstütztes Dateiformat: {file_path} (möglich: .xlsx, .csv, .parquet, .feather)")
+
+
+def write_lagerliste_file(file_path, lagerort, regal_typ, regale, faecher, ebenen, sonderorte, radsaetze=1):
+    """
+    Erzeugt die Lagerliste und speichert sie im Format der Dateiendung.
+    .xlsx wie write_lagerliste_excel, alle anderen Formate zeilenweise ohne DataFrame.
+    """
+    fmt = detect_format(file_path)
+    if fmt == "xlsx":
+        return write_lagerliste_excel(file_path, lagerort, regal_typ, regale, faecher, ebenen, sonderorte, radsaetze)
+
+    rows = iter_lagerliste_rows(lagerort, regal_typ, regale, faecher, ebenen, sonderorte, radsaetze)
+    with stage(f"{fmt or 'list'}_write"):
+        write_rows(rows, file_path, columns_for(radsaetze))
+    return True
+
+
+def _typed_rows(rows, columns):
+    # Werte wie in einer erzeugten Lagerliste: Zahlen-Spalten als int, alles andere als Text, leere Zellen als None
+    int_positions = {i for i, name in enumerate(columns) if name in INT_COLUMNS}
+    for row in rows:
+        typed = []
+        for i, val in enumerate(row):
+            text = cell_text(val)
+            if not text.strip():
+                typed.append(None)
+            elif i in int_positions and text.strip().lstrip("-").isdigit():
+                typed.append(int(text))
+            else:
+                typed.append(text)
+        # Ganz leere Zeilen (z.B. formatierte, aber leere Excel-Zeilen am Ende) weglassen
+        if any(v is not None for v in typed):
+            yield typed
+
+
+def convert_lagerliste(source, target):
+    """
+    Wandelt eine Lagerliste in ein anderes Format um (Formate nach Dateiendung, z.B. .xlsx -> .parquet).
+    Alle Spalten bleiben erhalten. Gibt den Zielpfad zurück.
+    """
+    if detect_format(source) is None:
+        raise ValueError(f"Nicht unterstütztes Dateiformat: {source} (möglich: .xlsx, .csv, .parquet, .feather)")
+    if os.path.abspath(source) == os.path.abspath(target):
+        raise ValueError("Quelle und Ziel sind dieselbe Datei")
+    columns = [name for name in sheet_columns(source) if name]
+    # Zeilenweise von der Quelle ins Ziel, ohne die Liste im Speicher aufzubauen
+    rows = timed_iter("read", _typed_rows(iter_sheet_rows(source, columns), columns))
+    with stage("list_write"):
+        write_rows(rows, target, columns)
+    return target
@@ -0,0 +1,180 @@
+"""
+Paralleles Rendern großer Etiketten-PDFs.
+
+Die Etiketten werden in seitenbündige Blöcke (CHUNK_PAGES Seiten) aufgeteilt,
+jeder Block wird in einem eigenen Prozess als PDF gerendert und die Teile
+werden anschließend in der ursprünglichen Reihenfolge zusammengefügt.
+
+Die Blockgröße hängt nicht von der Anzahl der Worker ab und alle Teile werden
+mit invariant=1 erzeugt. Dadurch ist die fertige PDF byte-identisch, egal mit
+wie vielen Workern (ab 1) sie erstellt wurde. Der sequenzielle Standardweg ohne
+workers schreibt wie bisher Zeitstempel und ID in die PDF und weicht daher ab.
+
+Zum Zusammenfügen wird pypdf benötigt. Fehlt es, wird sequenziell in eine
+Datei gerendert.
+
+render_shards schreibt stattdessen mehrere Dateien mit höchstens max_pages
+Seiten (etiketten_001.pdf, etiketten_002.pdf, ...), ebenfalls parallel.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+
+from stocklist import formats, qrcache
+from stocklist.pdf import labels_per_page, render_label_pdf
+from stocklist.profiling import count, stage
+
+
+CHUNK_PAGES = 20  # Seiten pro Block
+
+
+def split_pages(records, per_page, chunk_pages=CHUNK_PAGES):
+    """
+    Teilt die Etiketten in Blöcke, die jeweils auf einer neuen Seite beginnen.
+    """
+    size = max(1, per_page * chunk_pages)
+    return [records[i:i + size] for i in range(0, len(records), size)]
+
+
+def init_worker(disk_dir, formats_path):
+    # Festplatten-Cache und Formatdatei des Hauptprozesses auch in den Workern nutzen
+    if disk_dir:
+        qrcache.configure(disk_dir=disk_dir)
+    formats.configure(formats_path)
+
+
+def _stats_delta(before):
+    # Cache-Zähler dieses Workers seit before (ein Worker rendert meist mehrere Blöcke)
+    return {key: value - before[key] for key, value in qrcache.cache_stats().items()}
+
+
+def _render_chunk(kind, records, fmt_value, qr_backend):
+    before = qrcache.cache_stats()
+    buf = BytesIO()
+    render_label_pdf(kind, buf, records, fmt_value, qr_backend, invariant=1)
+    return buf.getvalue(), _stats_delta(before)
+
+
+def _collect(pool, results, chunks, total, progress):
+    # Ergebnisse in Reihenfolge einsammeln, Cache-Zähler der Worker übernehmen und Fortschritt
+    # melden; bei Abbruch (Exception aus progress) noch nicht gestartete Blöcke verwerfen statt
+    # auf sie zu warten
+    collected = []
+    done = 0
+    try:
+        for (result, stats), chunk in zip(results, chunks):
+            qrcache.merge_stats(stats)
+            collected.append(result)
+            done += len(chunk)
+            if progress:
+                progress(done, total)
+    except BaseException:
+        pool.shutdown(cancel_futures=True)
+        raise
+    return collected
+
+
+def merge_pdfs(parts, output_pdf):
+    """
+    Fügt die PDF-Teile (Bytes) in der gegebenen Reihenfolge zu einer Datei zusammen.
+    """
+    from pypdf import PdfReader, PdfWriter
+
+    writer = PdfWriter()
+    for part in parts:
+        writer.append(PdfReader(BytesIO(part)))
+    with open(output_pdf, "wb") as f:
+        writer.write(f)
+
+
+def render_sharded(
+    kind, output_pdf, records, fmt_value, qr_backend, workers, chunk_pages=CHUNK_PAGES, progress=None
+):
+    """
+    Rendert die Etiketten (kind = "single" oder "a4") blockweise mit `workers` Prozessen nach output_pdf.
+    progress(erledigt, gesamt) wird nach jedem fertigen Block aufgerufen.
+    """
+    try:
+        import pypdf  # noqa: F401
+    except ImportError:
+        # Fallback: ohne pypdf kein Zusammenfügen möglich, daher in einem Stück rendern
+        render_label_pdf(kind, output_pdf, records, fmt_value, qr_backend, invariant=1, progress=progress)
+        return
+
+    records = list(records)
+    chunks = split_pages(records, labels_per_page(kind, fmt_value), chunk_pages)
+    if not chunks:
+        render_label_pdf(kind, output_pdf, records, fmt_value, qr_backend, invariant=1)
+        return
+
+    disk_dir = qrcache.get_cache().disk_dir
+    initargs = (disk_dir, formats.formats_path())
+    count("chunks", len(chunks))
+    with stage("render_chunks"), ProcessPoolExecutor(
+        max_workers=workers, initializer=init_worker, initargs=initargs
+    ) as pool:
+        results = pool.map(
+            _render_chunk,
+            [kind] * len(chunks),
+            chunks,
+            [fmt_value] * len(chunks),
+            [qr_backend] * len(chunks),
+        )
+        parts = _collect(pool, results, chunks, len(records), progress)
+
+    with stage("merge"):
+        merge_pdfs(parts, output_pdf)
+
+
+def shard_paths(output_pdf, count):
+    """
+    Dateinamen der Teildateien: etiketten.pdf -> etiketten_001.pdf, etiketten_002.pdf, ...
+    """
+    stem, ext = os.path.splitext(output_pdf)
+    width = max(3, len(str(count)))
+    return [f"{stem}_{i + 1:0{width}d}{ext or '.pdf'}" for i in range(count)]
+
+
+def _render_shard_file(kind, path, records, fmt_value, qr_backend):
+    before = qrcache.cache_stats()
+    render_label_pdf(kind, path, records, fmt_value, qr_backend)
+    return path, _stats_delta(before)
+
+
+def render_shards(kind, output_pdf, records, fmt_value, qr_backend, max_pages, workers=None, progress=None):
+    """
+    Schreibt die Etiketten in mehrere PDFs mit je höchstens max_pages Seiten.
+    Die Dateien werden parallel erzeugt (workers Prozesse, Standard: Anzahl CPUs).
+    progress(erledigt, gesamt) wird nach jeder fertigen Datei aufgerufen.
+    Liefert die Liste der geschriebenen Dateien.
+    """
+    records = list(records)
+    chunks = split_pages(records, labels_per_page(kind, fmt_value), max_pages) or [[]]
+    paths = shard_paths(output_pdf, len(chunks))
+
+    workers = min(workers or os.cpu_count() or 1, len(chunks))
+    count("files", len(chunks))
+    if workers <= 1:
+        done = 0
+        for path, chunk in zip(paths, chunks):
+            render_label_pdf(kind, path, chunk, fmt_value, qr_backend)
+            done += len(chunk)
+            if progress:
+                progress(done, len(records))
+        return paths
+
+    disk_dir = qrcache.get_cache().disk_dir
+    initargs = (disk_dir, formats.formats_path())
+    with stage("render_shards"), ProcessPoolExecutor(
+        max_workers=workers, initializer=init_worker, initargs=initargs
+    ) as pool:
+        results = pool.map(
+            _render_shard_file,
+            [kind] * len(chunks),
+            paths,
+            chunks,
+            [fmt_value] * len(chunks),
+            [qr_backend] * len(chunks),
+        )
+        _collect(pool, results, chunks, len(records), progress)
+    return paths
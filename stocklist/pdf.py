@@ -0,0 +1,575 @@
+import os
+from functools import lru_cache
+
+from PIL import Image
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.utils import ImageReader
+from reportlab.pdfgen import canvas
+
+from stocklist.formats import get_format
+from stocklist.layout import fit_font_size, label_layout, split_label_text
+from stocklist.profiling import count, stage
+from stocklist.qrcache import qr_image_reader
+from stocklist.qrvector import draw_qr_vector
+from stocklist.reader import (
+    LABEL_REQUIRED, SPECIAL_REQUIRED, iter_label_records, iter_special_locations, require_columns, supports_streaming,
+)
+
+
+# --------------------------------
+# Konfiguration: Hintergrundgrafik für Sonderlagerorte A4-PDF
+# --------------------------------
+# Lege die Datei unter diesem Pfad ab (Standard: im gleichen Ordner wie das Skript).
+BACKGROUND_IMAGE_PATH = "QR_A4_Hintergrund_hoch.png"  # z.B. "sonderlagerorte_bg.jpg" oder "assets/bg.png"
+BACKGROUND_FIT_MODE = "cover"  # "cover" (seitenfüllend, Beschnitt möglich) oder "contain" (komplett sichtbar, evtl. Ränder)
+BACKGROUND_DPI = None  # z.B. 150: Grafik vor dem Einbetten auf diese Druckauflösung verkleinern (None = Original)
+
+# QR-Ausgabe: "png" (Rasterbild, bisheriges Verhalten) oder "vector" (Rechtecke direkt im PDF)
+QR_BACKENDS = ("png", "vector")
+QR_BACKEND = "png"
+
+
+# --------------------------------
+# PDF-Helfer (ReportLab)
+# --------------------------------
+
+def fit_text_to_width(c, text, max_width, max_font_size, min_font_size=6, font_name="Helvetica-Bold"):
+    """
+    Größte Schriftgröße (in 0,5-pt-Schritten ab max_font_size), bei der text in max_width passt.
+    Das Ergebnis wird zwischengespeichert (siehe stocklist.layout.fit_font_size); c wird nicht mehr
+    benötigt und bleibt nur aus Kompatibilitätsgründen in der Signatur.
+    """
+    return fit_font_size(text, font_name, max_width, max_font_size, min_font_size)
+
+
+def draw_qr(c, payload, x, y, size, backend=QR_BACKEND):
+    """
+    Zeichnet einen QR-Code in das Quadrat (x, y, size, size), je nach backend als PNG oder Vektor.
+    """
+    if backend == "vector":
+        with stage("qr_vector"):
+            draw_qr_vector(c, payload, x, y, size)
+    elif backend == "png":
+        with stage("qr_encode"):
+            ir = qr_image_reader(payload)
+        with stage("draw_image"):
+            c.drawImage(ir, x, y, size, size)
+    else:
+        raise ValueError(f"Unbekanntes QR-Backend: {backend}")
+
+
+def _background_placement(iw, ih, page_w, page_h, mode="cover"):
+    """
+    Position und Größe (x, y, draw_w, draw_h) der Hintergrundgrafik auf der Seite.
+    """
+    page_ratio = page_w / page_h
+    img_ratio = iw / ih
+
+    if mode == "contain":
+        # Bild vollständig sichtbar, passt in die Seite (Ränder möglich)
+        if img_ratio >= page_ratio:
+            draw_w = page_w
+            draw_h = page_w / img_ratio
+        else:
+            draw_h = page_h
+            draw_w = page_h * img_ratio
+    else:
+        # cover: seitenfüllend, ggf. Beschnitt
+        if img_ratio >= page_ratio:
+            # durch Höhe begrenzt (Bild breiter als Seite)
+            draw_h = page_h
+            draw_w = page_h * img_ratio
+        else:
+            # durch Breite begrenzt (Bild schmaler als Seite)
+            draw_w = page_w
+            draw_h = page_w / img_ratio
+    x = (page_w - draw_w) / 2
+    y = (page_h - draw_h) / 2
+    return x, y, draw_w, draw_h
+
+
+def load_background(bg_path, page_w, page_h, mode="cover", dpi=None):
+    """
+    Lädt die Hintergrundgrafik nur einmal (Cache je Datei/Änderungszeit/Seitengröße/Modus/DPI)
+    und skaliert sie bei Angabe von dpi auf die Druckauflösung herunter.
+    Liefert (ImageReader, x, y, draw_w, draw_h) oder None, wenn die Grafik fehlt oder ungültig ist.
+    """
+    if not bg_path:
+        return None
+    try:
+        mtime = os.path.getmtime(bg_path)
+    except OSError:
+        return None
+    return _load_background(bg_path, mtime, page_w, page_h, mode, dpi)
+
+
+@lru_cache(maxsize=8)
+def _load_background(bg_path, mtime, page_w, page_h, mode, dpi):
+    try:
+        img = Image.open(bg_path)
+        img.load()
+        x, y, draw_w, draw_h = _background_placement(img.width, img.height, page_w, page_h, mode)
+
+        if dpi:
+            # Zielgröße in Pixeln bei dpi (1 pt = 1/72 Zoll); nur verkleinern, nie hochrechnen
+            target = (max(1, round(draw_w / 72 * dpi)), max(1, round(draw_h / 72 * dpi)))
+            if target[0] < img.width:
+                img = img.resize(target, Image.LANCZOS)
+
+        return ImageReader(img), x, y, draw_w, draw_h
+    except Exception:
+        # Optional: logging/Messagebox
+        return None
+
+
+def register_background_form(c, page_w, page_h, bg_path, mode="cover", dpi=None, name="hintergrund"):
+    """
+    Legt die Hintergrundgrafik einmal als Form-XObject im PDF an; jede Seite zeichnet sie dann
+    per c.doForm(name), statt das Bild neu zu laden und einzubetten.
+    Gibt den Formularnamen zurück (None, wenn es keinen Hintergrund gibt).
+    """
+    bg = load_background(bg_path, page_w, page_h, mode, dpi)
+    if bg is None:
+        return None
+    ir, x, y, draw_w, draw_h = bg
+    c.beginForm(name)
+    c.drawImage(ir, x, y, width=draw_w, height=draw_h, mask='auto')
+    c.endForm()
+    return name
+
+
+# --------------------------------
+# Excel einlesen & Etiketten zeichnen
+# --------------------------------
+
+def read_label_rows(excel_path):
+    """
+    Liest die Excel-Liste per pandas und liefert nur Zeilen mit QR-Daten, in umgekehrter Reihenfolge.
+    .xlsx-, .csv-, .parquet- und .feather-Dateien werden stattdessen mit stocklist.reader gestreamt.
+    """
+    import pandas as pd
+
+    df = pd.read_excel(excel_path)
+
+    # Wenn alte Excel mit "besondere Lagerorte" geöffnet wird: in "Sonderlagerorte" umbenennen
+    if "besondere Lagerorte" in df.columns and "Sonderlagerorte" not in df.columns:
+        df.rename(columns={"besondere Lagerorte": "Sonderlagerorte"}, inplace=True)
+    require_columns(df.columns, LABEL_REQUIRED, excel_path)
+
+    # Alle Zeilen berücksichtigen; Spalte H ignorieren. Nur Zeilen mit QR-Daten verwenden.
+    df = df[df["Daten für QR-Code"].notna() & (df["Daten für QR-Code"].astype(str).str.strip() != "")]
+    df = df.iloc[::-1]  # umgekehrte Reihenfolge
+    return df
+
+
+def label_records(df):
+    """
+    Wandelt die Zeilen in einfache Tupel (QR-Daten, Lagerort, Lagerplatz) um,
+    die sich auch an Worker-Prozesse übergeben lassen.
+    Alle Texte werden spaltenweise (vektorisiert) aufbereitet, ohne iterrows() und format_val je Zeile.
+    """
+    # pandas/NumPy erst hier laden: der gestreamte Weg (.xlsx/.csv) braucht sie nicht
+    from stocklist.lagerliste import format_column
+
+    qr_values = df["Daten für QR-Code"].astype(str).tolist()
+    lagerorte = df["Lagerort"].astype(str).where(df["Lagerort"].notna(), "").tolist()
+    lagerplaetze = format_column(df["Regal"]) + "-" + format_column(df["Fach"]) + "-" + format_column(df["Ebene"])
+    if "Radsatz" in df.columns:
+        # Mehrere Radsätze pro Fach: Lagerplatz "Regal-Fach-Ebene-Radsatz" (leere Zellen ohne Zusatz)
+        radsatz = format_column(df["Radsatz"])
+        lagerplaetze = lagerplaetze.where(radsatz == "", lagerplaetze + "-" + radsatz)
+    return list(zip(qr_values, lagerorte, lagerplaetze.tolist()))
+
+
+class LabelTemplate:
+    """
+    Vorlage für ein Etikett auf einem Canvas (Geometrie aus dem LabelFormat, Positionen aus stocklist.layout).
+
+    Die statischen Teile (Schnittrahmen und Lagerort-Zeile, die für alle Etiketten eines
+    Lagerorts gleich ist) werden einmal als Form-XObject angelegt und pro Etikett nur noch
+    per doForm platziert. QR-Code und Lagerplatz werden je Etikett gezeichnet.
+    """
+
+    def __init__(self, c, fmt, frame=False, name="etikett"):
+        self.c = c
+        self.format = fmt
+        self.frame = frame
+        self.name = name
+        self._forms = {}  # (Lagerort, Schriftgröße Lagerplatz) -> Formularname
+
+    def _static_form(self, lay):
+        # Die Höhe der Lagerort-Zeile hängt von der Schriftgröße des Lagerplatzes ab
+        lo = lay.lagerort
+        key = (lo.text, lay.lagerplatz.size)
+        name = self._forms.get(key)
+        if name is not None:
+            return name
+
+        c = self.c
+        fmt = self.format
+        name = f"{self.name}{len(self._forms)}"
+        lw = fmt.frame_line_width
+        # Begrenzungsrahmen etwas größer, damit die halbe Rahmenlinie außen nicht abgeschnitten wird
+        c.beginForm(name, lowerx=-lw, lowery=-lw, upperx=fmt.width + lw, uppery=fmt.height + lw)
+
+        c.setFont(lo.font, lo.size)
+        c.drawString(lo.x, lo.y, lo.text)
+
+        if self.frame:
+            # Rahmen um das Label (1px-ähnlich, dünn, für Ausschneiden)
+            c.setLineWidth(lw)
+            c.rect(0, 0, fmt.width, fmt.height, stroke=1, fill=0)
+
+        c.endForm()
+        self._forms[key] = name
+        return name
+
+    def draw(self, x, y, qr_value, lagerort, lagerplatz, qr_backend=QR_BACKEND):
+        """
+        Zeichnet ein Etikett mit der linken unteren Ecke bei (x, y).
+        """
+        c = self.c
+        with stage("layout"):
+            lay = label_layout(self.format, lagerort, lagerplatz)
+
+        # Statische Teile (Rahmen, Lagerort)
+        form = self._static_form(lay)
+        if x or y:
+            c.saveState()
+            c.translate(x, y)
+            c.doForm(form)
+            c.restoreState()
+        else:
+            c.doForm(form)
+
+        # QR links, vertikal zentriert
+        draw_qr(c, qr_value, x + lay.qr_x, y + lay.qr_y, lay.qr_size, qr_backend)
+
+        # Lagerplatz (vertikal zentriert zusammen mit der Lagerort-Zeile)
+        lp = lay.lagerplatz
+        c.setFont(lp.font, lp.size)
+        c.drawString(x + lp.x, y + lp.y, lp.text)
+
+
+def _total(records):
+    # Anzahl für Fortschrittsanzeigen (None bei Generatoren)
+    return len(records) if hasattr(records, "__len__") else None
+
+
+def draw_single_labels(c, records, fmt_value, qr_backend=QR_BACKEND, progress=None):
+    """
+    Zeichnet ein Etikett pro Seite (Seitengröße = Etikettenformat).
+    progress(erledigt, gesamt) wird nach jedem Etikett aufgerufen (z.B. für die GUI).
+    """
+    template = LabelTemplate(c, get_format(fmt_value))
+    total = _total(records)
+
+    n = 0
+    for n, (qr_value, lagerort, lagerplatz) in enumerate(records, 1):
+        template.draw(0, 0, qr_value, lagerort, lagerplatz, qr_backend)
+        c.showPage()
+        if progress:
+            progress(n, total)
+    count("labels", n)
+    count("pages", n)
+
+
+def draw_a4_labels(c, records, fmt_value, qr_backend=QR_BACKEND, progress=None):
+    """
+    Zeichnet die Etiketten im Raster auf A4-Seiten (Spalten/Reihen siehe Etikettenformat).
+    progress(erledigt, gesamt) wird nach jedem Etikett aufgerufen (z.B. für die GUI).
+    """
+    layout = get_format(fmt_value)
+    template = LabelTemplate(c, layout, frame=True)
+    cells = layout.cells
+    total = _total(records)
+
+    i = 0
+    n = 0
+    for n, (qr_value, lagerort, lagerplatz) in enumerate(records, 1):
+        x, y = cells[i]
+        template.draw(x, y, qr_value, lagerort, lagerplatz, qr_backend)
+        if progress:
+            progress(n, total)
+
+        # nächste Zelle
+        i += 1
+        if i == len(cells):
+            i = 0
+            c.showPage()
+    count("labels", n)
+    count("pages", -(-n // len(cells)))
+
+
+# Etikettenarten -> Zeichenfunktion
+LABEL_KINDS = {
+    "single": draw_single_labels,
+    "a4": draw_a4_labels,
+}
+
+
+def labels_per_page(kind, fmt_value):
+    if kind == "a4":
+        return get_format(fmt_value).per_sheet
+    return 1
+
+
+def render_label_pdf(kind, output, records, fmt_value, qr_backend=QR_BACKEND, invariant=0, progress=None):
+    """
+    Schreibt die Etiketten (kind = "single" oder "a4") als PDF nach output (Pfad oder Datei-Objekt).
+    invariant=1 erzeugt byte-identische PDFs (ohne Zeitstempel/zufällige ID).
+    records wird nicht vorab in eine Liste kopiert; bei Generatoren meldet progress gesamt=None.
+    """
+    layout = get_format(fmt_value)
+    pagesize = layout.sheet_size if kind == "a4" else layout.page_size
+
+    c = canvas.Canvas(output, pagesize=pagesize, invariant=invariant)
+    with stage("draw"):
+        LABEL_KINDS[kind](c, records, fmt_value, qr_backend, progress)
+    with stage("save"):
+        c.save()
+
+
+def read_label_records(excel_path, selection=None):
+    """
+    (QR-Daten, Lagerort, Lagerplatz) aus der Excel-Liste, in Druckreihenfolge.
+    selection (siehe stocklist.reader.LabelSelection) wird schon beim Einlesen angewendet.
+    """
+    with stage("read"):
+        if supports_streaming(excel_path):
+            # .xlsx/.csv/.parquet/.feather (Format nach Endung) zeilenweise, nur die benötigten Spalten;
+            # wegen der umgekehrten Reihenfolge als Liste kompakter Tupel (Gesamtzahl für den Fortschritt)
+            return iter_label_records(excel_path, selection=selection)
+        df = read_label_rows(excel_path)
+        if selection:
+            radsatz = df["Radsatz"] if "Radsatz" in df.columns else [None] * len(df)
+            df = df[[selection.matches(*row) for row in zip(df["Regal"], df["Fach"], df["Ebene"], radsatz)]]
+        return label_records(df)
+
+
+def render_labels(
+    kind, output_pdf, records, fmt_value, qr_backend=QR_BACKEND, workers=None,
+    incremental=False, delta_pdf=None, max_pages=None, progress=None,
+):
+    """
+    Rendert fertige Etiketten (QR-Daten, Lagerort, Lagerplatz) je nach Option in eine PDF,
+    parallel (workers), inkrementell (incremental/delta_pdf) oder in mehrere Dateien (max_pages).
+    Mit workers (auch 1) wird mit invariant=1 gerendert, die PDF ist dann unabhängig von der
+    Worker-Anzahl byte-identisch. Ohne workers enthält sie wie bisher Zeitstempel und ID.
+    Gibt output_pdf bzw. bei max_pages die Liste der Teildateien zurück.
+    """
+    if max_pages and (incremental or delta_pdf):
+        raise ValueError("Aufteilen in mehrere Dateien ist mit dem inkrementellen Modus nicht kombinierbar")
+
+    if max_pages:
+        from stocklist.parallel import render_shards
+
+        return render_shards(kind, output_pdf, records, fmt_value, qr_backend, max_pages, workers, progress)
+    if incremental or delta_pdf:
+        from stocklist.incremental import render_incremental
+
+        render_incremental(kind, output_pdf, records, fmt_value, qr_backend, delta_pdf=delta_pdf, workers=workers)
+    elif workers:
+        from stocklist.parallel import render_sharded
+
+        render_sharded(kind, output_pdf, records, fmt_value, qr_backend, workers, progress=progress)
+    else:
+        render_label_pdf(kind, output_pdf, records, fmt_value, qr_backend, progress=progress)
+    return output_pdf
+
+
+def _create_labels(
+    kind, excel_path, output_pdf, fmt_value, qr_backend, workers,
+    incremental=False, delta_pdf=None, selection=None, max_pages=None, progress=None,
+):
+    records = read_label_records(excel_path, selection)
+    return render_labels(
+        kind, output_pdf, records, fmt_value, qr_backend, workers, incremental, delta_pdf, max_pages, progress
+    )
+
+
+# --------------------------------
+# Punkt 1: Komplette PDF (Einzel-Etiketten dynamisch nach Format)
+# --------------------------------
+
+def create_qr_labels_from_excel(
+    excel_path, output_pdf, fmt_value, qr_backend=QR_BACKEND, workers=None,
+    incremental=False, delta_pdf=None, selection=None, max_pages=None, progress=None,
+):
+    """
+    Ein Etikett pro PDF-Seite (Seitengröße = Etikettenformat).
+    Mit workers > 0 wird seitenweise in mehreren Prozessen gerendert (siehe stocklist.parallel).
+    Mit incremental=True werden nur geänderte Seiten neu gerendert, delta_pdf erhält zusätzlich
+    nur die neuen/geänderten Etiketten (siehe stocklist.incremental).
+    selection (stocklist.reader.LabelSelection) druckt nur einen Teil der Regale/Fächer/Ebenen.
+    Die Liste wird zeilenweise und nur mit den benötigten Spalten gelesen, wegen der umgekehrten
+    Druckreihenfolge aber vollständig (als kompakte Tupel), bevor das erste Etikett gezeichnet wird.
+    Mit max_pages werden mehrere Dateien mit höchstens max_pages Seiten parallel geschrieben;
+    dann wird die Liste der Dateipfade zurückgegeben.
+    progress(erledigt, gesamt) meldet den Fortschritt (siehe stocklist.jobs).
+    Gibt den Pfad der erzeugten PDF zurück (None, wenn kein Pfad angegeben wurde).
+    """
+    if not excel_path or not output_pdf:
+        return
+    return _create_labels(
+        "single", excel_path, output_pdf, fmt_value, qr_backend, workers,
+        incremental, delta_pdf, selection, max_pages, progress,
+    )
+
+
+# --------------------------------
+# A4-PDF dynamisch nach Format
+# --------------------------------
+
+def get_label_specs(fmt_value: str):
+    """
+    Liefert (label_w_mm, label_h_mm, cols, rows) je nach gewähltem Etikettenformat (siehe stocklist.formats).
+    """
+    return get_format(fmt_value).specs()
+
+
+def create_qr_labels_a4(
+    excel_path, output_pdf, fmt_value, qr_backend=QR_BACKEND, workers=None,
+    incremental=False, delta_pdf=None, selection=None, max_pages=None, progress=None,
+):
+    """
+    Etiketten im Raster auf A4-Seiten (Spalten/Reihen siehe Etikettenformat).
+    Mit workers > 0 wird seitenweise in mehreren Prozessen gerendert (siehe stocklist.parallel).
+    Mit incremental=True werden nur geänderte Seiten neu gerendert, delta_pdf erhält zusätzlich
+    nur die neuen/geänderten Etiketten (siehe stocklist.incremental).
+    selection (stocklist.reader.LabelSelection) druckt nur einen Teil der Regale/Fächer/Ebenen.
+    Die Liste wird zeilenweise und nur mit den benötigten Spalten gelesen, wegen der umgekehrten
+    Druckreihenfolge aber vollständig (als kompakte Tupel), bevor das erste Etikett gezeichnet wird.
+    Mit max_pages werden mehrere Dateien mit höchstens max_pages Seiten parallel geschrieben;
+    dann wird die Liste der Dateipfade zurückgegeben.
+    progress(erledigt, gesamt) meldet den Fortschritt (siehe stocklist.jobs).
+    Gibt den Pfad der erzeugten PDF zurück (None, wenn kein Pfad angegeben wurde).
+    """
+    if not excel_path or not output_pdf:
+        return
+    return _create_labels(
+        "a4", excel_path, output_pdf, fmt_value, qr_backend, workers,
+        incremental, delta_pdf, selection, max_pages, progress,
+    )
+
+
+# --------------------------------
+# Punkt 3: Einzelnes Lagerplatzetikett
+# --------------------------------
+
+def create_single_qr(input_text, output_pdf, fmt_value, qr_backend=QR_BACKEND):
+    """
+    Erzeugt ein einzelnes Etikett im gewählten Format (siehe stocklist.formats) mit QR links und Texten rechts.
+    input_text erwartet Format 'Lagerort;Lagerplatz'. Der komplette input_text wird als QR-Inhalt genutzt.
+    Gibt den Pfad der erzeugten PDF zurück (None, wenn kein Text/Pfad angegeben wurde).
+    """
+    if not input_text or not output_pdf:
+        return
+
+    # Zerlege Anzeige-Texte
+    lagerort, lagerplatz = split_label_text(input_text)
+
+    render_label_pdf("single", output_pdf, [(input_text, lagerort, lagerplatz)], fmt_value, qr_backend)
+    return output_pdf
+
+
+# --------------------------------
+# Punkt 4: PDF für Sonderlagerorte (mit festem Hintergrund)
+# --------------------------------
+
+def read_special_locations(excel_path):
+    """
+    Liest Spalte "Sonderlagerorte" per pandas (für Dateien, die openpyxl nicht streamen kann).
+    """
+    import pandas as pd
+
+    df = pd.read_excel(excel_path)
+    # Abwärtskompatibel: Spalte umbenennen, falls nötig
+    if "besondere Lagerorte" in df.columns and "Sonderlagerorte" not in df.columns:
+        df.rename(columns={"besondere Lagerorte": "Sonderlagerorte"}, inplace=True)
+    require_columns(df.columns, SPECIAL_REQUIRED, excel_path)
+
+    # Nur Zeilen, die einen Eintrag in "Sonderlagerorte" haben
+    df = df[df["Sonderlagerorte"].notna() & (df["Sonderlagerorte"].astype(str).str.strip() != "")]
+    return [str(v).strip() for v in df["Sonderlagerorte"]]
+
+
+def create_special_locations_pdf(
+    excel_path, output_pdf, qr_backend=QR_BACKEND, background_dpi=BACKGROUND_DPI, progress=None
+):
+    """
+    Nutzt ausschließlich Spalte H ("Sonderlagerorte") aus der Excel-Datei.
+    Auf jeder Seite wird eine feste Hintergrundgrafik gezeichnet (siehe BACKGROUND_IMAGE_PATH / BACKGROUND_FIT_MODE).
+    Die Grafik wird dafür einmal geladen (optional auf background_dpi verkleinert) und als Form-XObject wiederverwendet.
+    QR-Code-Daten werden als "<Text>;" aufgebaut, alle anderen Felder sind irrelevant/leergelassen.
+    progress(erledigt, gesamt) wird nach jeder Seite aufgerufen.
+    Gibt den Pfad der erzeugten PDF zurück (None, wenn kein Pfad angegeben wurde).
+    """
+    if not excel_path or not output_pdf:
+        return
+
+    with stage("read"):
+        if supports_streaming(excel_path):
+            # Nur wenige kurze Texte: als Liste, damit der Fortschritt die Gesamtzahl kennt
+            special_texts = list(iter_special_locations(excel_path))
+        else:
+            special_texts = read_special_locations(excel_path)
+    return render_special_locations_pdf(output_pdf, special_texts, qr_backend, background_dpi, progress)
+
+
+def render_special_locations_pdf(
+    output_pdf, special_texts, qr_backend=QR_BACKEND, background_dpi=BACKGROUND_DPI, progress=None
+):
+    """
+    Schreibt eine A4-Seite je Sonderlagerort (Texte z.B. aus der Excel-Liste oder direkt aus der Eingabe).
+    progress(erledigt, gesamt) wird nach jeder Seite aufgerufen (gesamt=None bei Generatoren).
+    """
+    total = _total(special_texts)
+
+    c = canvas.Canvas(output_pdf, pagesize=A4)
+    page_w, page_h = A4
+    with stage("background"):
+        bg_form = register_background_form(
+            c, page_w, page_h, BACKGROUND_IMAGE_PATH, mode=BACKGROUND_FIT_MODE, dpi=background_dpi
+        )
+
+    n = 0
+    for n, special_text in enumerate(special_texts, 1):
+        # 1) Hintergrund pro Seite (einmal eingebettet, hier nur referenziert)
+        if bg_form:
+            c.doForm(bg_form)
+
+        qr_value = f"{special_text};"  # QR aus Spalte H
+        lagerort = special_text        # Obere Textzeile = spezieller Ort
+        lagerplatz = ""                # Kein Lagerplatz für Sonderlagerorte
+
+        # 1/3 Seite für Text
+        fs_lo = fit_text_to_width(c, lagerort, page_w - 40, 48, font_name="Helvetica")
+        fs_lp = fit_text_to_width(c, lagerplatz, page_w - 40, 60, font_name="Helvetica-Bold")
+
+        # Lagerort oben
+        c.setFont("Helvetica", fs_lo)
+        tw = c.stringWidth(lagerort, "Helvetica", fs_lo)
+        y_cursor = page_h - fs_lo * 4
+        c.drawString((page_w - tw) / 2, y_cursor, lagerort)
+
+        # Lagerplatz darunter (leer)
+        c.setFont("Helvetica-Bold", fs_lp)
+        tw = c.stringWidth(lagerplatz, "Helvetica-Bold", fs_lp)
+        y_cursor -= (fs_lp + 10)
+        c.drawString((page_w - tw) / 2, y_cursor, lagerplatz)
+
+        # QR-Code in den restlichen 2/3 der Seite
+        available_h = y_cursor - 50
+        qr_size = min(available_h, page_w - 100)
+        draw_qr(c, qr_value, (page_w - qr_size) / 2, 50, qr_size, qr_backend)
+
+        c.showPage()
+        if progress:
+            progress(n, total)
+    count("labels", n)
+    count("pages", n)
+
+    with stage("save"):
+        c.save()
+    return output_pdf
@@ -0,0 +1,70 @@
+"""
+Etiketten-PDFs direkt aus dem Regalaufbau, ohne Umweg über die Excel-Datei.
+
+Bisher wurde die Lagerliste als .xlsx gespeichert und für jede PDF wieder
+eingelesen. Hier kommen die Etiketten direkt aus stocklist.lagerliste
+(LocationLabels, konstanter Speicherbedarf), die Sonderlagerorte direkt aus
+der Eingabe. Die Excel-Liste für die Etikettendrucker-Software wird nur bei
+Bedarf im selben Auftrag mitgeschrieben, aber nie wieder eingelesen.
+
+Die PDFs sind identisch zu denen aus der gespeicherten Excel-Liste.
+"""
+from stocklist.lagerliste import LocationLabels
+from stocklist.listfile import write_lagerliste_file
+from stocklist.pdf import QR_BACKEND, render_labels, render_special_locations_pdf
+from stocklist.profiling import stage
+
+
+def _offset_progress(progress, offset, total):
+    # Fortschritt einer Teilausgabe auf den ganzen Auftrag umrechnen
+    if progress is None:
+        return None
+
+    def report(done, _total=None):
+        progress(offset + done, total)
+
+    return report
+
+
+def create_from_layout(
+    lagerort, regal_typ, regale, faecher, ebenen, sonderorte=(), radsaetze=1,
+    excel_path=None, a4_pdf=None, single_pdf=None, special_pdf=None,
+    fmt_value=None, qr_backend=QR_BACKEND, workers=None, incremental=False,
+    selection=None, max_pages=None, progress=None,
+):
+    """
+    Erzeugt aus dem Regalaufbau die gewünschten Ausgaben in einem Durchgang:
+    excel_path (Lagerliste .xlsx, auch .csv/.parquet/.feather), a4_pdf (Etiketten im A4-Raster),
+    single_pdf (ein Etikett pro Seite) und special_pdf (Sonderlagerorte). Nicht angegebene Ausgaben werden übersprungen.
+    Optionen wie bei stocklist.pdf.create_qr_labels_a4 (workers, incremental, selection, max_pages).
+    progress(erledigt, gesamt) zählt die Etiketten aller PDFs zusammen.
+    Liefert {Ausgabe: Pfad bzw. Liste der Teildateien}.
+    """
+    grid = (lagerort, regal_typ, regale, faecher, ebenen, radsaetze)
+    labels = LocationLabels(*grid, selection=selection)
+    special_texts = [o.strip() for o in sonderorte if o.strip()]
+
+    label_pdfs = [(kind, path) for kind, path in (("a4", a4_pdf), ("single", single_pdf)) if path]
+    total = len(labels) * len(label_pdfs) + (len(special_texts) if special_pdf else 0)
+
+    outputs = {}
+    if excel_path:
+        write_lagerliste_file(excel_path, lagerort, regal_typ, regale, faecher, ebenen, sonderorte, radsaetze)
+        outputs["excel"] = excel_path
+
+    done = 0
+    for kind, path in label_pdfs:
+        with stage(f"labels_{kind}"):
+            outputs[kind] = render_labels(
+                kind, path, labels, fmt_value, qr_backend, workers,
+                incremental=incremental, max_pages=max_pages,
+                progress=_offset_progress(progress, done, total),
+            )
+        done += len(labels)
+
+    if special_pdf:
+        with stage("labels_special"):
+            outputs["special"] = render_special_locations_pdf(
+                special_pdf, special_texts, qr_backend, progress=_offset_progress(progress, done, total)
+            )
+    return outputs
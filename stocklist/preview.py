@@ -0,0 +1,175 @@
+import threading
+from functools import lru_cache
+
+from PIL import Image, ImageDraw, ImageFont
+from reportlab.lib.pagesizes import mm
+
+from stocklist.formats import get_format
+from stocklist.layout import label_layout, split_label_text
+from stocklist.qrcache import qr_image
+
+
+# ----------------------------
+# Textmessung (Pillow-kompatibel)
+# ----------------------------
+
+def pil_measure_text(draw: ImageDraw.ImageDraw, text: str, font: ImageFont.FreeTypeFont):
+    """
+    Misst Textbreite und -höhe robust, kompatibel zu neuen/alten Pillow-Versionen.
+    """
+    if hasattr(draw, "textbbox"):
+        bbox = draw.textbbox((0, 0), text, font=font)
+        w = bbox[2] - bbox[0]
+        h = bbox[3] - bbox[1]
+        return w, h
+    # Fallback
+    return draw.textsize(text, font=font)
+
+
+# --------------------------------
+# Vorschau (korrekte Reihenfolge & Größen) + Rahmen
+# --------------------------------
+
+@lru_cache(maxsize=None)
+def get_ttf(bold=False):
+    # Arial hat die gleichen Laufweiten wie Helvetica im PDF; DejaVu als Ersatz (Linux)
+    names = ("arialbd.ttf", "DejaVuSans-Bold.ttf") if bold else ("arial.ttf", "DejaVuSans.ttf")
+    for name in names:
+        try:
+            return ImageFont.truetype(name, 20)
+        except Exception:
+            continue
+    return ImageFont.load_default()
+
+
+@lru_cache(maxsize=256)
+def load_font(path, size):
+    """
+    Lädt eine TrueType-Schrift je (Pfad, Größe) nur einmal von der Platte.
+    """
+    return ImageFont.truetype(path, size)
+
+
+# Zeichenfläche nur zum Messen (Ergebnis hängt nicht vom Zielbild ab)
+_MEASURE_DRAW = ImageDraw.Draw(Image.new("RGB", (1, 1)))
+
+
+@lru_cache(maxsize=64)
+def _qr_thumbnail(input_text, size):
+    # QR-Code in Vorschaugröße, wird beim Tippen für denselben Text nicht neu skaliert
+    return qr_image(input_text).resize((size, size))
+
+
+@lru_cache(maxsize=1024)
+def _line_font(text, bold, size_pt, width_pt, px_per_pt):
+    # PIL-Schrift für eine Zeile aus dem Layout: gleiche Größe wie im PDF, bei breiterer Ersatzschrift
+    # so weit verkleinert, dass der Text genauso breit wird wie im PDF
+    base = get_ttf(bold)
+    path = getattr(base, "path", None)
+    if path is None:
+        return base
+    size = max(1, round(size_pt * px_per_pt))
+    font = load_font(path, size)
+    w, _ = pil_measure_text(_MEASURE_DRAW, text, font)
+    target = width_pt * px_per_pt
+    if w > target > 0:
+        size = max(1, int(size * target / w))
+        font = load_font(path, size)
+    return font
+
+
+def render_preview(input_text, fmt_value, scale=1.0):
+    """
+    Vorschau des Etiketts als PIL-Bild, gezeichnet nach demselben Layout wie die PDF (stocklist.layout).
+    scale < 1 rendert direkt in der Anzeigegröße (z.B. 0.6 = 6 px pro mm) statt groß zu rendern
+    und herunterzuskalieren.
+    """
+    # Maße aus dem Etikettenformat (siehe stocklist.formats); Standard 10 px pro mm
+    fmt = get_format(fmt_value)
+    px_per_mm = fmt.preview["px_per_mm"] * scale
+    px_per_pt = px_per_mm / mm
+
+    w, h = round(fmt.width_mm * px_per_mm), round(fmt.height_mm * px_per_mm)
+    img = Image.new("RGB", (w, h), "white")
+    draw = ImageDraw.Draw(img)
+
+    # 1px Rahmen um das gesamte Etikett
+    draw.rectangle([(0, 0), (w - 1, h - 1)], outline="black", width=1)
+
+    lagerort, lagerplatz = split_label_text(input_text)
+    lay = label_layout(fmt, lagerort, lagerplatz)
+
+    # QR links, vertikal zentriert (PDF-Koordinaten: Ursprung unten links)
+    qr_px = round(lay.qr_size * px_per_pt)
+    qr_top = round(h - (lay.qr_y + lay.qr_size) * px_per_pt)
+    img.paste(_qr_thumbnail(input_text, qr_px), (round(lay.qr_x * px_per_pt), qr_top))
+
+    # Lagerort und Lagerplatz an den Grundlinien aus dem Layout
+    for line in (lay.lagerort, lay.lagerplatz):
+        if not line.text:
+            continue
+        font = _line_font(line.text, line.font.endswith("Bold"), line.size, line.width, px_per_pt)
+        x = line.x * px_per_pt
+        y = h - line.y * px_per_pt
+        if isinstance(font, ImageFont.FreeTypeFont):
+            draw.text((x, y), line.text, font=font, fill="black", anchor="ls")
+        else:
+            draw.text((x, y - line.size * px_per_pt), line.text, font=font, fill="black")
+
+    return img
+
+
+class PreviewRenderer:
+    """
+    Rendert Vorschaubilder in einem Hintergrund-Thread.
+
+    request() merkt sich nur die jeweils neueste Anfrage; ältere, noch nicht begonnene
+    Anfragen werden verworfen. take() liefert das neueste fertige Bild (oder None) und
+    wird von der GUI z.B. per root.after abgefragt. Der Thread fasst tkinter nicht an.
+    """
+
+    def __init__(self, scale=1.0):
+        self.scale = scale
+        self._cond = threading.Condition()
+        self._request = None   # (Nr., Text, Format)
+        self._result = None    # (Nr., Bild)
+        self._seq = 0
+        self._taken = 0
+        self._thread = threading.Thread(target=self._work, name="stocklist-preview", daemon=True)
+        self._thread.start()
+
+    def request(self, input_text, fmt_value):
+        with self._cond:
+            self._seq += 1
+            self._request = (self._seq, input_text, fmt_value)
+            self._cond.notify()
+            return self._seq
+
+    def take(self):
+        """
+        Neuestes fertiges Vorschaubild, falls seit dem letzten Aufruf ein neues vorliegt.
+        Bilder zu inzwischen überholten Anfragen werden nicht mehr ausgeliefert.
+        """
+        with self._cond:
+            if self._result is None:
+                return None
+            seq, img = self._result
+            if seq <= self._taken or seq != self._seq:
+                return None
+            self._taken = seq
+            return img
+
+    def _work(self):
+        while True:
+            with self._cond:
+                while self._request is None:
+                    self._cond.wait()
+                seq, input_text, fmt_value = self._request
+                self._request = None
+            try:
+                img = render_preview(input_text, fmt_value, self.scale)
+            except Exception:
+                # Vorschau ist optional (z.B. Text zu lang für einen QR-Code)
+                continue
+            with self._cond:
+                self._result = (seq, img)
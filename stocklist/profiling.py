@@ -0,0 +1,229 @@
+"""
+Zeitmessung und Profiling für die Erzeugungs-Pipeline.
+
+Die Renderer markieren ihre Stufen (Excel lesen, QR kodieren, Bild zeichnen,
+PDF speichern, ...) mit stage("name") und zählen Etiketten, Seiten usw. mit
+count("name"). Solange kein Lauf gemessen wird, sind beide fast kostenlos.
+
+Gemessen wird nur innerhalb von profile_run(...), und zwar im aufrufenden
+Thread (GUI-Vorschau und Hintergrund-Jobs stören sich nicht). Am Ende steht
+eine JSON-Zusammenfassung; optional wird zusätzlich ein cProfile- bzw.
+pyinstrument-Profil geschrieben.
+
+Stufen dürfen verschachtelt sein: "seconds" enthält die inneren Stufen,
+"self_seconds" nur die Zeit in der Stufe selbst. In Worker-Prozessen
+(stocklist.parallel) wird nicht gemessen, dort zählt nur die Wartezeit im
+Hauptprozess.
+"""
+import json
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+
+PROFILERS = ("cprofile", "pyinstrument")
+
+_local = threading.local()
+
+
+class RunProfile:
+    """
+    Messwerte eines Laufs: Zeit und Aufrufe je Stufe sowie Zähler.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.started = datetime.now().isoformat(timespec="seconds")
+        self.stages = {}    # Name -> [Sekunden, Sekunden ohne innere Stufen, Aufrufe]
+        self.counters = {}
+        self.wall = None
+        self._stack = []    # offene Stufen: [Name, Zeit der inneren Stufen]
+        self._t0 = time.perf_counter()
+
+    def count(self, name, n=1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def _enter(self, name):
+        self._stack.append([name, 0.0])
+
+    def _exit(self, elapsed):
+        name, inner = self._stack.pop()
+        if self._stack:
+            self._stack[-1][1] += elapsed
+        entry = self.stages.get(name)
+        if entry is None:
+            entry = self.stages[name] = [0.0, 0.0, 0]
+        entry[0] += elapsed
+        entry[1] += elapsed - inner
+        entry[2] += 1
+
+    def finish(self):
+        self.wall = time.perf_counter() - self._t0
+
+    def summary(self):
+        """
+        Zusammenfassung als dict (für JSON).
+        """
+        return {
+            "job": self.name,
+            "started": self.started,
+            "wall_s": round(self.wall if self.wall is not None else time.perf_counter() - self._t0, 4),
+            "stages": {
+                name: {"seconds": round(total, 4), "self_seconds": round(own, 4), "calls": calls}
+                for name, (total, own, calls) in self.stages.items()
+            },
+            "counters": dict(self.counters),
+        }
+
+    def write(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.summary(), f, indent=2, ensure_ascii=False)
+
+
+class _Stage:
+    __slots__ = ("profile", "name", "t0")
+
+    def __init__(self, profile, name):
+        self.profile = profile
+        self.name = name
+
+    def __enter__(self):
+        self.profile._enter(self.name)
+        self.t0 = time.perf_counter()
+
+    def __exit__(self, *exc):
+        self.profile._exit(time.perf_counter() - self.t0)
+
+
+class _NoStage:
+    __slots__ = ()
+
+    def __enter__(self):
+        pass
+
+    def __exit__(self, *exc):
+        pass
+
+
+_NO_STAGE = _NoStage()
+
+
+def current():
+    """Der im aktuellen Thread laufende RunProfile (oder None)."""
+    return getattr(_local, "profile", None)
+
+
+def stage(name):
+    """
+    Context-Manager um eine Stufe: with stage("save"): c.save()
+    """
+    profile = getattr(_local, "profile", None)
+    if profile is None:
+        return _NO_STAGE
+    return _Stage(profile, name)
+
+
+def count(name, n=1):
+    profile = getattr(_local, "profile", None)
+    if profile is not None:
+        profile.count(name, n)
+
+
+def timed_iter(name, iterable):
+    """
+    Misst die Zeit, die das Abholen der Elemente kostet (z.B. zeilenweises Lesen der Excel-Datei),
+    als eigene Stufe. Ohne laufende Messung wird iterable unverändert zurückgegeben.
+    """
+    if current() is None:
+        return iterable
+    return _timed_iter(name, iter(iterable))
+
+
+def _timed_iter(name, it):
+    while True:
+        with stage(name):
+            try:
+                item = next(it)
+            except StopIteration:
+                return
+        yield item
+
+
+def _qr_cache_stats():
+    from stocklist.qrcache import cache_stats
+
+    return cache_stats()
+
+
+class _Dump:
+    # cProfile oder pyinstrument für den aktuellen Thread
+    def __init__(self, path, profiler):
+        if profiler not in PROFILERS:
+            raise ValueError(f"Unbekannter Profiler: {profiler} (verfügbar: {', '.join(PROFILERS)})")
+        self.path = path
+        self.profiler = profiler
+        if profiler == "pyinstrument":
+            from pyinstrument import Profiler
+
+            self._prof = Profiler()
+        else:
+            import cProfile
+
+            self._prof = cProfile.Profile()
+
+    def start(self):
+        if self.profiler == "pyinstrument":
+            self._prof.start()
+        else:
+            self._prof.enable()
+
+    def stop(self):
+        if self.profiler == "pyinstrument":
+            self._prof.stop()
+            with open(self.path, "w", encoding="utf-8") as f:
+                f.write(self._prof.output_html())
+        else:
+            self._prof.disable()
+            self._prof.dump_stats(self.path)
+
+
+@contextmanager
+def profile_run(name, summary_path=None, dump_path=None, profiler="cprofile"):
+    """
+    Misst alles, was im Block (im aktuellen Thread) passiert, und liefert den RunProfile.
+    summary_path: JSON-Zusammenfassung, dump_path: cProfile-Statistik (.prof, z.B. für pstats/snakeviz)
+    bzw. bei profiler="pyinstrument" eine HTML-Ansicht.
+    Die Zusammenfassung wird auch geschrieben, wenn der Lauf abbricht.
+    """
+    dump = _Dump(dump_path, profiler) if dump_path else None
+    profile = RunProfile(name)
+    qr_before = _qr_cache_stats()
+    previous = current()
+    _local.profile = profile
+    if dump:
+        dump.start()
+    try:
+        yield profile
+    finally:
+        if dump:
+            dump.stop()
+        _local.profile = previous
+        profile.finish()
+        # QR-Cache-Treffer dieses Laufs (der Cache wird auch von der Vorschau genutzt)
+        for key, value in _qr_cache_stats().items():
+            if value - qr_before[key]:
+                profile.count(f"qr_{key}", value - qr_before[key])
+        if summary_path:
+            profile.write(summary_path)
+
+
+def profiled(func, name, summary_path=None, dump_path=None, profiler="cprofile"):
+    """
+    Verpackt func so, dass jeder Aufruf mit profile_run gemessen wird (z.B. für stocklist.jobs).
+    """
+    def run(*args, **kwargs):
+        with profile_run(name, summary_path, dump_path, profiler):
+            return func(*args, **kwargs)
+
+    return run
@@ -0,0 +1,260 @@
+"""
+Cache für QR-Codes.
+
+Gleiche Inhalte (Nachdruck eines Lagers, Live-Vorschau bei jedem Tastendruck)
+werden nur einmal kodiert. Zwischengespeichert werden:
+- die QR-Matrix (Module inkl. Rand) je (Inhalt, Fehlerkorrektur, Rand),
+- das fertige PNG (ca. 1 KB) je (Inhalt, Fehlerkorrektur, Modulgröße, Rand).
+
+Dekodierte PIL-Bilder und ReportLab-ImageReader sind rund tausendmal so groß
+wie das PNG. Sie liegen nur in einem kleinen eigenen LRU (decoded_maxsize),
+damit ein Druckauftrag mit lauter verschiedenen Etiketten nicht jedes Bild im
+Speicher behält.
+
+Optional werden PNGs zusätzlich auf der Festplatte abgelegt (disk_dir), damit
+auch ein neuer Prozess (z.B. der nächste Batch-Lauf) sie wiederverwenden kann.
+"""
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from io import BytesIO
+
+import qrcode
+from PIL import Image
+from reportlab.lib.utils import ImageReader
+
+
+# Standardwerte wie qrcode.make()
+ERROR_CORRECTION = qrcode.constants.ERROR_CORRECT_M
+BOX_SIZE = 10
+BORDER = 4
+
+# Anzahl dekodierter Bilder/ImageReader (z.B. für die Live-Vorschau)
+DECODED_MAXSIZE = 16
+
+
+class LRUCache:
+    """
+    Einfacher LRU-Cache mit begrenzter Größe und Treffer-/Fehlzählern.
+    Threadsicher (GUI-Vorschau und Hintergrund-Jobs teilen sich den Cache).
+    """
+
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self):
+        return len(self._data)
+
+
+class QRCache:
+    """
+    QR-Code-Cache mit Speicher-LRU und optionaler Ablage auf der Festplatte.
+    """
+
+    def __init__(self, maxsize=1024, disk_dir=None, decoded_maxsize=DECODED_MAXSIZE):
+        self.matrices = LRUCache(maxsize)
+        self.images = LRUCache(maxsize)
+        self.decoded = LRUCache(decoded_maxsize)
+        self.disk_dir = disk_dir
+        self.disk_hits = 0
+        # Zähler aus Worker-Prozessen (siehe merge_stats)
+        self.worker_stats = {}
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    # ---- Matrix ----
+
+    def matrix(self, payload, error_correction=ERROR_CORRECTION, border=BORDER):
+        """
+        Liefert die QR-Matrix als Tupel von Zeilen (Tupel aus bool, True = dunkles Modul), inkl. Rand.
+        """
+        key = (payload, error_correction, border)
+        m = self.matrices.get(key)
+        if m is None:
+            qr = qrcode.QRCode(error_correction=error_correction, border=border)
+            qr.add_data(payload)
+            qr.make(fit=True)
+            m = tuple(tuple(row) for row in qr.get_matrix())
+            self.matrices.put(key, m)
+        return m
+
+    # ---- Rasterbilder ----
+
+    def _png(self, key):
+        # PNG-Bytes aus dem Speicher, von der Festplatte oder neu erzeugt
+        png = self.images.get(key)
+        if png is not None:
+            return png
+
+        png = self._disk_load(key)
+        if png is not None:
+            self.disk_hits += 1
+        else:
+            img = self._render(*key)
+            buf = BytesIO()
+            img.save(buf, format="PNG")
+            png = buf.getvalue()
+            self._disk_store(key, png)
+            # Das gerade erzeugte Bild wird oft sofort gebraucht (Vorschau)
+            self.decoded.put(key, {"image": img, "reader": None})
+        self.images.put(key, png)
+        return png
+
+    def _decoded(self, key):
+        entry = self.decoded.get(key)
+        if entry is None:
+            entry = {"image": None, "reader": None}
+            self.decoded.put(key, entry)
+        return entry
+
+    def _render(self, payload, error_correction, box_size, border):
+        # Pixelgleich zu qrcode.make(...).convert("RGB"), aber aus der gecachten Matrix
+        m = self.matrix(payload, error_correction, border)
+        n = len(m)
+        img = Image.new("1", (n, n))
+        img.putdata([0 if dark else 1 for row in m for dark in row])
+        return img.resize((n * box_size, n * box_size), Image.NEAREST).convert("RGB")
+
+    def png(self, payload, error_correction=ERROR_CORRECTION, box_size=BOX_SIZE, border=BORDER):
+        """PNG-Bytes des QR-Codes."""
+        return self._png((payload, error_correction, box_size, border))
+
+    def image(self, payload, error_correction=ERROR_CORRECTION, box_size=BOX_SIZE, border=BORDER):
+        """PIL-Bild (RGB) des QR-Codes. Wird geteilt und darf nicht verändert werden."""
+        key = (payload, error_correction, box_size, border)
+        png = self._png(key)
+        entry = self._decoded(key)
+        if entry["image"] is None:
+            img = Image.open(BytesIO(png))
+            img.load()
+            entry["image"] = img
+        return entry["image"]
+
+    def image_reader(self, payload, error_correction=ERROR_CORRECTION, box_size=BOX_SIZE, border=BORDER):
+        """ReportLab-ImageReader des QR-Codes (für c.drawImage)."""
+        key = (payload, error_correction, box_size, border)
+        png = self._png(key)
+        entry = self._decoded(key)
+        if entry["reader"] is None:
+            entry["reader"] = ImageReader(BytesIO(png))
+        return entry["reader"]
+
+    # ---- Festplatte ----
+
+    def _disk_path(self, key):
+        digest = hashlib.sha256(repr(key).encode("utf-8")).hexdigest()
+        return os.path.join(self.disk_dir, digest[:2], digest + ".png")
+
+    def _disk_load(self, key):
+        if not self.disk_dir:
+            return None
+        try:
+            with open(self._disk_path(key), "rb") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _disk_store(self, key, png):
+        if not self.disk_dir:
+            return
+        path = self._disk_path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(png)
+            os.replace(tmp, path)
+        except OSError:
+            # Festplatten-Cache ist optional
+            pass
+
+    # ---- Statistik ----
+
+    def stats(self):
+        own = {
+            "matrix_hits": self.matrices.hits,
+            "matrix_misses": self.matrices.misses,
+            "image_hits": self.images.hits,
+            "image_misses": self.images.misses,
+            "disk_hits": self.disk_hits,
+        }
+        return {key: value + self.worker_stats.get(key, 0) for key, value in own.items()}
+
+    def merge_stats(self, stats):
+        """
+        Addiert Zähler, die ein Worker-Prozess mit seinem eigenen Cache gesammelt hat.
+        """
+        for key, value in stats.items():
+            self.worker_stats[key] = self.worker_stats.get(key, 0) + value
+
+    def clear(self):
+        self.matrices.clear()
+        self.images.clear()
+        self.decoded.clear()
+        self.disk_hits = 0
+        self.worker_stats = {}
+
+
+_cache = QRCache()
+
+
+def get_cache():
+    return _cache
+
+
+def configure(maxsize=1024, disk_dir=None):
+    """
+    Ersetzt den globalen Cache (z.B. mit Festplatten-Ablage für Batch-Läufe).
+    """
+    global _cache
+    _cache = QRCache(maxsize=maxsize, disk_dir=disk_dir)
+    return _cache
+
+
+def qr_matrix(payload, error_correction=ERROR_CORRECTION, border=BORDER):
+    return _cache.matrix(payload, error_correction, border)
+
+
+def qr_image(payload, error_correction=ERROR_CORRECTION, box_size=BOX_SIZE, border=BORDER):
+    return _cache.image(payload, error_correction, box_size, border)
+
+
+def qr_image_reader(payload, error_correction=ERROR_CORRECTION, box_size=BOX_SIZE, border=BORDER):
+    return _cache.image_reader(payload, error_correction, box_size, border)
+
+
+def cache_stats():
+    return _cache.stats()
+
+
+def merge_stats(stats):
+    _cache.merge_stats(stats)
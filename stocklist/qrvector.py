@@ -0,0 +1,75 @@
+"""
+Vektor-Ausgabe von QR-Codes für ReportLab.
+
+Statt PIL-Bild -> PNG -> ImageReader -> Bild-XObject wird die QR-Matrix direkt
+als gefüllte Rechtecke auf den Canvas gezeichnet. Zusammenhängende dunkle
+Module einer Zeile werden zu einem Rechteck zusammengefasst, gleiche Läufe in
+aufeinanderfolgenden Zeilen wachsen nach unten weiter. Das ergibt deutlich
+kleinere PDFs und scharfe Kanten beim Druck.
+"""
+from functools import lru_cache
+
+from stocklist.qrcache import BORDER, ERROR_CORRECTION, qr_matrix
+
+
+def qr_rectangles(matrix):
+    """
+    Fasst die dunklen Module einer QR-Matrix zu Rechtecken zusammen.
+    Liefert eine Liste von (spalte, zeile, breite, höhe) in Modulen, Zeile 0 = oben.
+    """
+    rects = []
+    open_runs = {}  # (start, ende) -> Index in rects, Läufe der vorherigen Zeile
+    for r, row in enumerate(matrix):
+        runs = []
+        n = len(row)
+        col = 0
+        while col < n:
+            if row[col]:
+                start = col
+                while col < n and row[col]:
+                    col += 1
+                runs.append((start, col))
+            else:
+                col += 1
+
+        new_open = {}
+        for run in runs:
+            idx = open_runs.get(run)
+            if idx is not None:
+                # gleicher Lauf wie in der Zeile darüber: Rechteck nach unten verlängern
+                rects[idx][3] += 1
+            else:
+                idx = len(rects)
+                rects.append([run[0], r, run[1] - run[0], 1])
+            new_open[run] = idx
+        open_runs = new_open
+
+    return [tuple(rect) for rect in rects]
+
+
+@lru_cache(maxsize=1024)
+def _cached_rectangles(payload, error_correction, border):
+    matrix = qr_matrix(payload, error_correction, border)
+    return len(matrix), tuple(qr_rectangles(matrix))
+
+
+def draw_qr_vector(c, payload, x, y, size, error_correction=ERROR_CORRECTION, border=BORDER):
+    """
+    Zeichnet den QR-Code (inkl. weißem Rand, wie beim PNG) als Vektorgrafik
+    in das Quadrat (x, y, size, size) auf dem Canvas.
+    """
+    n, rects = _cached_rectangles(payload, error_correction, border)
+    module = size / n
+
+    c.saveState()
+    # Weißer Untergrund wie beim PNG (wichtig z.B. auf Hintergrundgrafiken)
+    c.setFillColorRGB(1, 1, 1)
+    c.rect(x, y, size, size, stroke=0, fill=1)
+
+    c.setFillColorRGB(0, 0, 0)
+    path = c.beginPath()
+    top = y + size
+    for col, row, w, h in rects:
+        path.rect(x + col * module, top - (row + h) * module, w * module, h * module)
+    c.drawPath(path, stroke=0, fill=1)
+    c.restoreState()
@@ -0,0 +1,346 @@
+"""
+Zeilenweises Einlesen der Lagerliste für die PDF-Erzeugung.
+
+Statt pd.read_excel + iterrows() wird die Datei gestreamt und es werden nur die
+Spalten geparst, die der jeweilige Renderer braucht. Die Etiketten werden als
+einfache Tupel (QR-Daten, Lagerort, Lagerplatz) geliefert, sodass das Zeichnen
+schon während des Einlesens beginnen kann.
+
+Das Format wird an der Dateiendung erkannt (ohne bekannte Endung am Dateianfang):
+- .xlsx/.xlsm mit openpyxl im read_only-Modus,
+- .csv mit dem csv-Modul (Trennzeichen "," oder ";", UTF-8 oder Windows-1252),
+- .parquet/.feather spaltenweise mit pyarrow (optional, Datei per Memory-Mapping).
+"""
+import codecs
+import csv
+import itertools
+
+
+# Spalten für Lagerplatz-Etiketten bzw. Sonderlagerorte ("Radsatz" nur bei mehreren Radsätzen pro Fach)
+LABEL_COLUMNS = ("Daten für QR-Code", "Lagerort", "Regal", "Fach", "Ebene", "Radsatz")
+SPECIAL_COLUMNS = ("Sonderlagerorte",)
+# Ohne diese Spalten ist die Datei keine Lagerliste (falsche Datei/falsches Blatt)
+LABEL_REQUIRED = LABEL_COLUMNS[:5]
+SPECIAL_REQUIRED = SPECIAL_COLUMNS
+
+# Dateiformate der Lagerliste nach Endung (alles andere, z.B. .xls/.ods, liest pandas.read_excel)
+LIST_FORMATS = {
+    ".xlsx": "xlsx",
+    ".xlsm": "xlsx",
+    ".csv": "csv",
+    ".parquet": "parquet",
+    ".pq": "parquet",
+    ".feather": "feather",
+    ".arrow": "feather",
+}
+PANDAS_SUFFIXES = (".xls", ".xlsb", ".ods")
+
+# Kodierung von CSV-Dateien: UTF-8 (write_lagerliste_file, Excel "CSV UTF-8"), sonst Windows-1252
+# (Excel "CSV (Trennzeichen-getrennt)" auf deutschem Windows)
+CSV_ENCODINGS = ("utf-8-sig", "cp1252")
+
+# Dateianfänge, falls die Endung nichts verrät
+MAGIC_BYTES = ((b"PAR1", "parquet"), (b"ARROW1", "feather"), (b"PK\x03\x04", "xlsx"))
+
+
+def detect_format(path):
+    """
+    Format der Lagerliste ("xlsx", "csv", "parquet", "feather") oder None für Dateien, die nur pandas lesen kann.
+    """
+    path = str(path)
+    suffix = path[path.rfind("."):].lower() if "." in path else ""
+    if suffix in LIST_FORMATS:
+        return LIST_FORMATS[suffix]
+    if suffix in PANDAS_SUFFIXES:
+        return None
+    try:
+        with open(path, "rb") as f:
+            head = f.read(8)
+    except OSError:
+        return None
+    for magic, fmt in MAGIC_BYTES:
+        if head.startswith(magic):
+            return fmt
+    return None
+
+
+def supports_streaming(path):
+    return detect_format(path) is not None
+
+
+def require_pyarrow():
+    """
+    Importiert pyarrow (nur für Parquet/Feather nötig) mit verständlicher Fehlermeldung.
+    """
+    try:
+        import pyarrow
+    except ImportError:
+        raise ImportError("Für Parquet/Feather wird pyarrow benötigt (pip install pyarrow)") from None
+    return pyarrow
+
+
+def cell_text(val):
+    """
+    Zellwert als Text wie format_val: ganze Zahlen ohne ".0", leere Zellen als "".
+    """
+    if val is None:
+        return ""
+    if isinstance(val, float) and val.is_integer():
+        return str(int(val))
+    return str(val)
+
+
+def _header_names(header):
+    names = [str(h).strip() if h is not None else "" for h in header]
+    # Abwärtskompatibel: alte Excel mit "besondere Lagerorte"
+    if "besondere Lagerorte" in names and "Sonderlagerorte" not in names:
+        names[names.index("besondere Lagerorte")] = "Sonderlagerorte"
+    return names
+
+
+def require_columns(names, required, path):
+    """
+    ValueError, wenn eine der Spalten required in names (Kopfzeile) fehlt.
+    """
+    for col in required:
+        if col not in names:
+            raise ValueError(f'Spalte "{col}" fehlt in {path}')
+
+
+def iter_sheet_rows(path, columns, required=()):
+    """
+    Liefert für jede Datenzeile der Lagerliste (bei Excel: erstes Blatt) ein Tupel mit den Werten der
+    gewünschten Spalten (in der Reihenfolge von columns). Fehlende Spalten liefern None, fehlt eine
+    Spalte aus required, gibt es beim ersten Lesen einen ValueError.
+    """
+    fmt = detect_format(path)
+    if fmt == "csv":
+        return _iter_csv_rows(path, columns, required)
+    if fmt in ("parquet", "feather"):
+        return _iter_arrow_rows(path, fmt, columns, required)
+    return _iter_xlsx_rows(path, columns, required)
+
+
+def sheet_columns(path):
+    """
+    Spaltennamen der Lagerliste (Kopfzeile), z.B. für die Umwandlung in ein anderes Format.
+    """
+    fmt = detect_format(path)
+    if fmt == "csv":
+        with _open_csv(path) as f:
+            return _header_names(next(_csv_reader(f), ()))
+    if fmt in ("parquet", "feather"):
+        return _header_names(_arrow_source(path, fmt)[0])
+    from openpyxl import load_workbook
+
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        return _header_names(next(wb.worksheets[0].iter_rows(min_row=1, max_row=1, values_only=True), ()))
+    finally:
+        wb.close()
+
+
+def _iter_xlsx_rows(excel_path, columns, required=()):
+    # openpyxl (lädt auch NumPy) erst hier, CSV/Parquet/Feather brauchen es nicht
+    from openpyxl import load_workbook
+
+    wb = load_workbook(excel_path, read_only=True, data_only=True)
+    try:
+        ws = wb.worksheets[0]
+        header = next(ws.iter_rows(min_row=1, max_row=1, values_only=True), ())
+        names = _header_names(header)
+        require_columns(names, required, excel_path)
+
+        positions = [names.index(col) if col in names else None for col in columns]
+        present = [p for p in positions if p is not None]
+        if not present:
+            return
+
+        # Nur den benötigten Spaltenbereich parsen
+        min_col = min(present)
+        max_col = max(present)
+        offsets = [p - min_col if p is not None else None for p in positions]
+
+        for row in ws.iter_rows(min_row=2, min_col=min_col + 1, max_col=max_col + 1, values_only=True):
+            yield tuple(row[o] if o is not None and o < len(row) else None for o in offsets)
+    finally:
+        wb.close()
+
+
+def _csv_encoding(path):
+    # Vorab prüfen, ob die ganze Datei gültiges UTF-8 ist: ein Dekodierfehler mitten im Lesen
+    # käme erst, wenn schon Etiketten gezeichnet wurden
+    decoder = codecs.getincrementaldecoder(CSV_ENCODINGS[0])()
+    try:
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                decoder.decode(block)
+            decoder.decode(b"", final=True)
+    except UnicodeDecodeError:
+        return CSV_ENCODINGS[1]
+    return CSV_ENCODINGS[0]
+
+
+def _open_csv(path):
+    return open(path, encoding=_csv_encoding(path), newline="")
+
+
+def _csv_reader(f):
+    # Trennzeichen aus der Kopfzeile: "," (write_lagerliste_file) oder ";" (deutsches Excel)
+    first = f.readline()
+    delimiter = ";" if first.count(";") > first.count(",") else ","
+    return csv.reader(itertools.chain([first], f), delimiter=delimiter)
+
+
+def _iter_csv_rows(csv_path, columns, required=()):
+    # Alle Werte kommen als Text, leere Zellen als ""
+    with _open_csv(csv_path) as f:
+        reader = _csv_reader(f)
+        names = _header_names(next(reader, ()))
+        require_columns(names, required, csv_path)
+        positions = [names.index(col) if col in names else None for col in columns]
+        if all(p is None for p in positions):
+            return
+        for row in reader:
+            if not row:
+                continue
+            yield tuple(row[p] if p is not None and p < len(row) else None for p in positions)
+
+
+def _arrow_source(path, fmt):
+    # (Spaltennamen, Funktion columns -> RecordBatches); die Datei wird gemappt statt kopiert
+    require_pyarrow()
+    if fmt == "parquet":
+        import pyarrow.parquet as pq
+
+        parquet_file = pq.ParquetFile(path, memory_map=True)
+        return parquet_file.schema_arrow.names, lambda cols: parquet_file.iter_batches(columns=cols)
+
+    import pyarrow.feather as feather
+
+    table = feather.read_table(path, memory_map=True)
+    return table.column_names, lambda cols: table.select(cols).to_batches()
+
+
+def _iter_arrow_rows(path, fmt, columns, required=()):
+    # Nur die benötigten Spalten lesen, je RecordBatch spaltenweise in Python-Werte umwandeln
+    raw_names, batches = _arrow_source(path, fmt)
+    names = _header_names(raw_names)
+    require_columns(names, required, path)
+    wanted = [raw_names[names.index(col)] if col in names else None for col in columns]
+    present = list(dict.fromkeys(w for w in wanted if w is not None))
+    if not present:
+        return
+    for batch in batches(present):
+        values = {name: batch.column(i).to_pylist() for i, name in enumerate(present)}
+        yield from zip(*(values[w] if w is not None else itertools.repeat(None, batch.num_rows) for w in wanted))
+
+
+def _sort_key(val):
+    # Zahlen numerisch, Buchstaben wie A..Z (kürzere zuerst), damit "2-10" und "A-C" als Bereiche funktionieren
+    text = cell_text(val).strip().upper()
+    if text.isdigit():
+        return 0, int(text), ""
+    return 1, len(text), text
+
+
+def parse_ranges(spec):
+    """
+    Wandelt "A-C,F" bzw. "1-10,15" in eine Liste von (von, bis)-Schlüsseln (jeweils inklusive).
+    None oder "" bedeutet: keine Einschränkung.
+    """
+    if not spec:
+        return None
+    ranges = []
+    for part in str(spec).split(","):
+        part = part.strip()
+        if not part:
+            continue
+        lo, sep, hi = part.partition("-")
+        lo = lo.strip()
+        hi = hi.strip() if sep else lo
+        lo_key, hi_key = _sort_key(lo), _sort_key(hi)
+        if not lo or not hi or lo_key > hi_key:
+            raise ValueError(f"Ungültiger Bereich: {part!r}")
+        ranges.append((lo_key, hi_key))
+    return ranges or None
+
+
+class LabelSelection:
+    """
+    Auswahl von Etiketten nach Regal, Fach, Ebene und Radsatz (z.B. regale="A-C", faecher="1-10", ebenen="1,2").
+    Wird schon beim Einlesen geprüft, nicht ausgewählte Zeilen werden weder aufbereitet noch gerendert.
+    """
+
+    def __init__(self, regale=None, faecher=None, ebenen=None, radsaetze=None):
+        self.regale = parse_ranges(regale)
+        self.faecher = parse_ranges(faecher)
+        self.ebenen = parse_ranges(ebenen)
+        self.radsaetze = parse_ranges(radsaetze)
+
+    def __bool__(self):
+        return bool(self.regale or self.faecher or self.ebenen or self.radsaetze)
+
+    @staticmethod
+    def _in(ranges, val):
+        if ranges is None:
+            return True
+        key = _sort_key(val)
+        return any(lo <= key <= hi for lo, hi in ranges)
+
+    def select(self, axis, values):
+        """
+        Nur die ausgewählten Werte einer Achse ("regale", "faecher", "ebenen" oder "radsaetze").
+        """
+        ranges = getattr(self, axis)
+        return [v for v in values if self._in(ranges, v)]
+
+    def matches(self, regal, fach, ebene, radsatz=None):
+        return (
+            self._in(self.regale, regal) and self._in(self.faecher, fach) and self._in(self.ebenen, ebene)
+            and self._in(self.radsaetze, radsatz)
+        )
+
+
+def iter_label_records(excel_path, reverse=True, selection=None):
+    """
+    Liefert (QR-Daten, Lagerort, Lagerplatz) für alle Zeilen mit QR-Daten (optional nur die per
+    selection ausgewählten, siehe LabelSelection).
+
+    reverse=True entspricht der bisherigen umgekehrten Reihenfolge. Da openpyxl nur vorwärts
+    lesen kann, werden dafür die kompakten Tupel gesammelt und als Liste in umgekehrter Reihenfolge
+    zurückgegeben (kein DataFrame; len() liefert die Gesamtzahl für Fortschrittsanzeigen).
+    Mit reverse=False wird vollständig gestreamt (Generator).
+    """
+    records = _iter_label_records(excel_path, selection)
+    if reverse:
+        records = list(records)
+        records.reverse()
+    return records
+
+
+def _iter_label_records(excel_path, selection=None):
+    for qr_value, lagerort, regal, fach, ebene, radsatz in iter_sheet_rows(excel_path, LABEL_COLUMNS, LABEL_REQUIRED):
+        if selection and not selection.matches(regal, fach, ebene, radsatz):
+            continue
+        qr_text = cell_text(qr_value)
+        # Nur Zeilen mit QR-Daten verwenden (leere Zellen, z.B. reine Sonderlagerort-Zeilen, überspringen)
+        if not qr_text.strip():
+            continue
+        lagerplatz = f"{cell_text(regal)}-{cell_text(fach)}-{cell_text(ebene)}"
+        if radsatz is not None and radsatz != "":
+            lagerplatz += f"-{cell_text(radsatz)}"
+        yield qr_text, cell_text(lagerort), lagerplatz
+
+
+def iter_special_locations(excel_path):
+    """
+    Liefert die Einträge aus Spalte "Sonderlagerorte" (getrimmt, leere Zellen übersprungen).
+    Fehlt die Spalte, gibt es einen ValueError.
+    """
+    for (special,) in iter_sheet_rows(excel_path, SPECIAL_COLUMNS, SPECIAL_REQUIRED):
+        if special is None:
+            continue
+        text = str(special).strip()
+        if text:
+            yield text